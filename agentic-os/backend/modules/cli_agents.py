@@ -4,21 +4,45 @@
 CLI for managing conversational agents (list, message, run turns, etc)
 """
 
+import re
 import typer
-import json
-import requests
 
-from shared import client_agents
+from modules.cli_core.json_codec import dumps as _dumps, loads as _loads
+
+# comma-separated list items, trimmed; empty items are dropped
+_CSV_ITEM_RE = re.compile(r"\s*([^,]*[^,\s])")
+
+
+def _split_csv(text: str) -> list:
+    return _CSV_ITEM_RE.findall(text)
+
+# Shared option definitions; built once instead of per command signature
+_REPO_URL_OPT          = typer.Option(..., "--repo-url", "-r", help="Repository URL to scope the query")
+_REPO_URL_OPT_OPTIONAL = typer.Option(None, "--repo-url", "-r", help="Repository URL")
+
+_GRAPH_FMTS = frozenset({"json", "mermaid", "graphviz"})
 
 app = typer.Typer(
     help="Manage conversational agents (list, message, run turns, etc)"
 )
 
-def print_json_result(func, *args, **kwargs):
-    """Wrap CLI command: print pretty JSON or error on failure."""
+def _client():
+    """
+    Import shared.client_agents (and with it requests/config) on first use,
+    so `--help` and unrelated subcommands don't pay for it.
+    """
+    from shared.config import config
+    # same scope the other CLI modules set (they may not be imported now)
+    config["SERVICE_NAME"] = "cli"
+    from shared import client_agents
+    return client_agents
+
+
+def _safe_call(func, *args, **kwargs):
+    """Run a client call, mapping transport/HTTP failures to CLI exits."""
+    import requests
     try:
-        result = func(*args, **kwargs)
-        typer.echo(json.dumps(result, indent=2))
+        return func(*args, **kwargs)
     except requests.exceptions.ConnectionError:
         typer.secho(
             "ERROR: Agents service is unreachable (connection refused). Is it running?",
@@ -28,37 +52,44 @@ def print_json_result(func, *args, **kwargs):
         raise typer.Exit(1)
     except requests.exceptions.HTTPError as e:
         typer.secho(f"ERROR: HTTP error from server: {e}", fg="red", err=True)
-        try:
-            err_resp = e.response.json()
-            typer.secho(json.dumps(err_resp, indent=2), fg="red", err=True)
-        except Exception:
-            pass
+        # the server already serialized the error body; echo it verbatim
+        if e.response is not None and e.response.text:
+            typer.secho(e.response.text, fg="red", err=True)
         raise typer.Exit(2)
     except Exception as e:
         typer.secho(f"ERROR: Unexpected error: {e}", fg="red", err=True)
         raise typer.Exit(99)
 
 
+def print_json_result(func, *args, **kwargs):
+    """Wrap CLI command: print pretty JSON or error on failure."""
+    typer.echo(_dumps(_safe_call(func, *args, **kwargs)))
+
+
 def echo_agent_table(agents):
     """Pretty print agent listing as a table."""
     if not agents:
         typer.echo("(no running agents)")
         return
 
-    fields = ["agent_role", "agent_id"]
-    if any("repo_url" in a for a in agents):
-        fields.append("repo_url")
-    if any("created_at" in a for a in agents):
-        fields.append("created_at")
-
-    header = "  ".join(f.ljust(14) for f in fields)
-    typer.echo(header)
+    # one pass over the listing to learn which optional columns exist
+    keys_seen = set()
+    for a in agents:
+        keys_seen.update(a)
+    fields = ["agent_role", "agent_id"] + [
+        f for f in ("repo_url", "created_at") if f in keys_seen
+    ]
+
+    # one template for header and rows: each cell left-padded to 14 chars
+    fmt = "  ".join(["{:<14}"] * len(fields))
+    typer.echo(fmt.format(*fields))
     typer.echo("-" * (16 * len(fields)))
     for a in agents:
-        row = "  ".join(str(a.get(f, ""))[:32].ljust(14) for f in fields)
-        typer.echo(row)
+        typer.echo(fmt.format(*[str(a.get(f, ""))[:32] for f in fields]))
 
 
+# print help and exit 0 when run without a subcommand (no_args_is_help
+# would exit 2 under Click 8.2, which scripts checking the status trip over)
 @app.callback(invoke_without_command=True)
 def main(ctx: typer.Context):
     if ctx.invoked_subcommand is None:
@@ -73,17 +104,17 @@ def main(ctx: typer.Context):
 @app.command("health")
 def health():
     """Check health of the agents service."""
-    print_json_result(client_agents.health)
+    print_json_result(_client().health)
 
 @app.command("ready")
 def ready():
     """Check readiness of agents service."""
-    print_json_result(client_agents.ready)
+    print_json_result(_client().ready)
 
 @app.command("status")
 def status():
     """Show service status."""
-    print_json_result(client_agents.status)
+    print_json_result(_client().status)
 
 
 #
@@ -92,28 +123,28 @@ def status():
 
 @app.command("list")
 def list_(
-    repo_url:  str = typer.Option(..., "--repo-url", "-r", help="Repository URL to scope the query"),
+    repo_url:  str = _REPO_URL_OPT,
 ):
     """List running agents."""
-    agents = client_agents.list_running_agents(repo_url)
+    agents = _client().list_running_agents(repo_url)
     echo_agent_table(agents)
 
 @app.command("current")
 def current(
-    repo_url:  str = typer.Option(..., "--repo-url", "-r", help="Repository URL to scope the query"),
+    repo_url:  str = _REPO_URL_OPT,
 ):
     """Show the current active agent."""
-    print_json_result(client_agents.get_current_running_agent, repo_url)
+    print_json_result(_client().get_current_running_agent, repo_url)
 
 @app.command("set-current")
 def set_current(
     agent_role: str = typer.Argument(..., help="Agent role to set as current"),
     agent_id:   str = typer.Argument(..., help="Agent ID to set as current"),
-    repo_url:   str = typer.Option(..., "--repo-url", "-r", help="Repository URL to scope the query"),
+    repo_url:   str = _REPO_URL_OPT,
 ):
     """Set the current agent pointer."""
     print_json_result(
-        client_agents.set_current_agent,
+        _client().set_current_agent,
         agent_role,
         agent_id,
         repo_url
@@ -134,33 +165,14 @@ def graph(
     format=graphviz → Graphviz DOT source
     """
     fmt = format.lower()
-    if fmt not in ("json", "mermaid", "graphviz"):
+    if fmt not in _GRAPH_FMTS:
         typer.secho(f"ERROR: Unknown format '{format}'", fg="red", err=True)
         raise typer.Exit(1)
 
-    try:
-        resp = client_agents.get_agent_call_graph(fmt)
-    except requests.exceptions.ConnectionError:
-        typer.secho(
-            "ERROR: Agents service is unreachable (connection refused). Is it running?",
-            fg="red", err=True
-        )
-        raise typer.Exit(1)
-    except requests.exceptions.HTTPError as e:
-        typer.secho(f"ERROR: HTTP error from server: {e}", fg="red", err=True)
-        try:
-            err = e.response.json()
-            typer.secho(json.dumps(err, indent=2), fg="red", err=True)
-        except Exception:
-            pass
-        raise typer.Exit(2)
-    except Exception as e:
-        typer.secho(f"ERROR: Unexpected error: {e}", fg="red", err=True)
-        raise typer.Exit(99)
-
+    resp = _safe_call(_client().get_agent_call_graph, fmt)
     data = resp.get("data")
     if fmt == "json":
-        typer.echo(json.dumps(data, indent=2))
+        typer.echo(_dumps(data))
     else:
         # mermaid or graphviz → raw string
         typer.echo(data)
@@ -173,12 +185,12 @@ def graph(
 @app.command("agent_role-list")
 def agent_role_list():
     """List agent role entries."""
-    print_json_result(client_agents.list_registry)
+    print_json_result(_client().list_registry)
 
 @app.command("agent_role-get")
 def agent_role_get(agent_role: str = typer.Argument(..., help="Agent role to get")):
     """Get a single agent role entry by name."""
-    print_json_result(client_agents.get_agent_role, agent_role)
+    print_json_result(_client().get_agent_role, agent_role)
 
 @app.command("agent_role-upsert")
 def agent_role_upsert(json_str: str = typer.Argument(..., help="JSON string payload for upsert")):
@@ -186,16 +198,16 @@ def agent_role_upsert(json_str: str = typer.Argument(..., help="JSON string payl
     Add or update an agent role. Pass the payload as JSON string.
     """
     try:
-        item = json.loads(json_str)
+        item = _loads(json_str)
     except Exception as e:
         typer.secho(f"Could not parse JSON payload: {e}", fg="red", err=True)
         raise typer.Exit(3)
-    print_json_result(client_agents.upsert_agent_role, **item)
+    print_json_result(_client().upsert_agent_role, **item)
 
 @app.command("agent_role-delete")
 def agent_role_delete(agent_role: str = typer.Argument(..., help="Agent role to delete")):
     """Delete an agent role by its name."""
-    print_json_result(client_agents.delete_agent_role, agent_role)
+    print_json_result(_client().delete_agent_role, agent_role)
 
 
 #
@@ -208,11 +220,11 @@ def messages_list(
     agent_id:   str = typer.Argument(..., help="Agent ID"),
     role:       str = typer.Option(None, help="Filter by message role"),
     turn_id:    int = typer.Option(None, help="Filter by turn number"),
-    repo_url:   str = typer.Option(None, "--repo-url", "-r", help="Repository URL"),
+    repo_url:   str = _REPO_URL_OPT_OPTIONAL,
 ):
     """List messages for the given agent."""
     print_json_result(
-        client_agents.list_messages,
+        _client().list_messages,
         agent_role,
         agent_id,
         repo_url,
@@ -227,17 +239,17 @@ def messages_add(
     role:       str = typer.Argument(..., help="Message role (e.g. user, assistant)"),
     content:    str = typer.Argument(..., help="Message content"),
     meta_json:  str = typer.Option("{}", help="Extra JSON metadata"),
-    repo_url:   str = typer.Option(None, "--repo-url", "-r", help="Repository URL"),
+    repo_url:   str = _REPO_URL_OPT_OPTIONAL,
 ):
     """Add a message for the agent."""
     try:
-        meta = json.loads(meta_json)
+        meta = _loads(meta_json)
     except Exception as e:
         typer.secho(f"Could not parse meta JSON: {e}", fg="red", err=True)
         raise typer.Exit(3)
 
     print_json_result(
-        client_agents.add_message,
+        _client().add_message,
         agent_role,
         agent_id,
         role,
@@ -251,11 +263,11 @@ def messages_get(
     agent_role: str = typer.Argument(..., help="Agent role"),
     agent_id:   str = typer.Argument(..., help="Agent ID"),
     message_id: int = typer.Argument(..., help="Message ID"),
-    repo_url:   str = typer.Option(None, "--repo-url", "-r", help="Repository URL"),
+    repo_url:   str = _REPO_URL_OPT_OPTIONAL,
 ):
     """Get a specific message by ID."""
     print_json_result(
-        client_agents.get_message,
+        _client().get_message,
         agent_role,
         agent_id,
         message_id,
@@ -267,11 +279,11 @@ def messages_remove(
     agent_role: str = typer.Argument(..., help="Agent role"),
     agent_id:   str = typer.Argument(..., help="Agent ID"),
     message_id: int = typer.Argument(..., help="Message ID"),
-    repo_url:   str = typer.Option(None, "--repo-url", "-r", help="Repository URL"),
+    repo_url:   str = _REPO_URL_OPT_OPTIONAL,
 ):
     """Remove a specific message by ID."""
     print_json_result(
-        client_agents.remove_message,
+        _client().remove_message,
         agent_role,
         agent_id,
         message_id,
@@ -282,18 +294,18 @@ def messages_remove(
 def broadcast(
     agent_roles:   str = typer.Argument(..., help="Comma-separated agent roles"),
     messages_json: str = typer.Argument(..., help="Message(s) JSON payload"),
-    repo_url:      str = typer.Option(None, "--repo-url", "-r", help="Repository URL"),
+    repo_url:      str = _REPO_URL_OPT_OPTIONAL,
 ):
     """
     Broadcast a message or messages to all agents in the specified roles.
     """
-    roles = [r.strip() for r in agent_roles.split(",") if r.strip()]
+    roles = _split_csv(agent_roles)
     try:
-        msgs = json.loads(messages_json)
+        msgs = _loads(messages_json)
     except Exception:
         msgs = messages_json
     print_json_result(
-        client_agents.broadcast_to_agents,
+        _client().broadcast_to_agents,
         roles,
         msgs,
         repo_url=repo_url,
@@ -310,11 +322,11 @@ def turns_list(
     agent_id:   str = typer.Argument(..., help="Agent ID"),
     limit:      int = typer.Option(50, help="Max turns to return"),
     offset:     int = typer.Option(0,  help="Pagination offset"),
-    repo_url:   str = typer.Option(None, "--repo-url", "-r", help="Repository URL"),
+    repo_url:   str = _REPO_URL_OPT_OPTIONAL,
 ):
     """List turns (tool invocation records) for the given agent."""
     print_json_result(
-        client_agents.list_turns,
+        _client().list_turns,
         agent_role,
         agent_id,
         repo_url,
@@ -327,11 +339,11 @@ def turns_get(
     agent_role: str = typer.Argument(..., help="Agent role"),
     agent_id:   str = typer.Argument(..., help="Agent ID"),
     turn:       int = typer.Argument(..., help="Turn number"),
-    repo_url:   str = typer.Option(None, "--repo-url", "-r", help="Repository URL"),
+    repo_url:   str = _REPO_URL_OPT_OPTIONAL,
 ):
     """Get a specific turn by its number."""
     print_json_result(
-        client_agents.get_turn,
+        _client().get_turn,
         agent_role,
         agent_id,
         repo_url,
@@ -342,11 +354,11 @@ def turns_get(
 def turns_metadata(
     agent_role: str = typer.Argument(..., help="Agent role"),
     agent_id:   str = typer.Argument(..., help="Agent ID"),
-    repo_url:   str = typer.Option(None, "--repo-url", "-r", help="Repository URL"),
+    repo_url:   str = _REPO_URL_OPT_OPTIONAL,
 ):
     """Get the per-conversation metadata dict for the given agent."""
     print_json_result(
-        client_agents.get_turns_metadata,
+        _client().get_turns_metadata,
         agent_role,
         agent_id,
         repo_url,
@@ -369,7 +381,7 @@ def run_agent_task(
     user prompt, and drive it to completion.
     """
     print_json_result(
-        client_agents.run_agent_task,
+        _client().run_agent_task,
         agent_role,
         repo_url,
         user_prompt,
@@ -385,11 +397,11 @@ def run_agent_task(
 def submit(
     agent_role: str = typer.Argument(..., help="The agent's role"),
     agent_id:   str = typer.Argument(..., help="Agent ID"),
-    repo_url:   str = typer.Option(None, "--repo-url", "-r", help="Repository URL"),
+    repo_url:   str = _REPO_URL_OPT_OPTIONAL,
 ):
     """Submit pending messages to the LLM for the given agent."""
     print_json_result(
-        client_agents.submit_to_llm,
+        _client().submit_to_llm,
         agent_role,
         agent_id,
         repo_url,
@@ -3,25 +3,44 @@
 import os
 import sys
 import json
-import requests
+import functools
+import re
 import typer
-import yaml
-import click
 from click.exceptions import UsageError
 
+from modules.cli_core.http import get_session
+from modules.cli_core.json_codec import dumps as _dumps, loads as _loads
+
+# comma-separated list items, trimmed; empty items are dropped
+_CSV_ITEM_RE = re.compile(r"\s*([^,]*[^,\s])")
+
+def _split_csv(text: str) -> list:
+    return _CSV_ITEM_RE.findall(text)
+
 CONFIG_KEY = "SERVICE_URL_CONFIGS"
 DEFAULT_API_URL = "http://localhost:8010"
 DEFAULT_SCOPE = "global"
 
+@functools.lru_cache(maxsize=1)
+def _parse_config_file(config_file: str, mtime: float) -> dict:
+    # keyed on mtime so an edited file is re-read; prefer libyaml's C loader
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(config_file, "r") as f:
+        data = yaml.load(f, Loader=loader)
+        return data or {}
+
+# .config.yml next to the entrypoint script
+_CONFIG_PATH = os.path.join(os.path.dirname(sys.argv[0]) or ".", ".config.yml")
+
 def load_config_file():
-    entrypoint_path = os.path.abspath(sys.argv[0])
-    entrypoint_dir = os.path.dirname(entrypoint_path)
-    config_file = os.path.join(entrypoint_dir, ".config.yml")
-    if os.path.exists(config_file):
-        with open(config_file, "r") as f:
-            data = yaml.safe_load(f)
-            return data or {}
-    return {}
+    # a single stat() both checks existence and gives the cache key; when the
+    # file is absent (the common case) yaml is never imported
+    try:
+        st = os.stat(_CONFIG_PATH)
+    except FileNotFoundError:
+        return {}
+    return _parse_config_file(_CONFIG_PATH, st.st_mtime)
 
 def resolve_api_url(api_url_opt: str) -> str:
     # Priority: explicit param > env > .config.yml > default
@@ -38,11 +57,12 @@ def resolve_api_url(api_url_opt: str) -> str:
 
 app = typer.Typer(invoke_without_command=True, add_completion=False)
 
+# print help and exit 0 without a subcommand (no_args_is_help exits 2)
 @app.callback(invoke_without_command=True)
 def main(ctx: typer.Context):
     """Solvin Configs CLI."""
     if ctx.invoked_subcommand is None:
-        click.echo(ctx.get_help())
+        typer.echo(ctx.get_help())
         raise typer.Exit()
 
 @app.command("list")
@@ -53,11 +73,11 @@ def list_config(
     """List all config entries in a scope (/config/list)."""
     url = resolve_api_url(api_url)
     typer.echo(f"Listing config entries in scope: {scope}", err=True)
-    r = requests.get(f"{url}/config/list", params={"scope": scope})
+    r = get_session().get(f"{url}/config/list", params={"scope": scope})
     if not r.ok:
         typer.secho(r.text, fg="red", err=True)
         raise typer.Exit(1)
-    typer.echo(json.dumps(r.json(), indent=2))
+    typer.echo(_dumps(r.json()))
 
 @app.command("get")
 def get_config(
@@ -67,11 +87,11 @@ def get_config(
 ):
     """Get a config entry (/config/get)."""
     url = resolve_api_url(api_url)
-    r = requests.get(f"{url}/config/get", params={"key": key, "scope": scope})
+    r = get_session().get(f"{url}/config/get", params={"key": key, "scope": scope})
     if not r.ok:
         typer.secho(r.text, fg="red", err=True)
         raise typer.Exit(1)
-    typer.echo(json.dumps(r.json(), indent=2))
+    typer.echo(_dumps(r.json()))
 
 @app.command("set")
 def set_config(
@@ -82,14 +102,14 @@ def set_config(
 ):
     """Set (add/update) a config entry (/config/set)."""
     url = resolve_api_url(api_url)
-    r = requests.post(
+    r = get_session().post(
         f"{url}/config/set",
         json={"key": key, "value": value, "scope": scope}
     )
     if not r.ok:
         typer.secho(r.text, fg="red", err=True)
         raise typer.Exit(1)
-    typer.echo(json.dumps(r.json(), indent=2))
+    typer.echo(_dumps(r.json()))
 
 @app.command("remove")
 def remove_config(
@@ -99,13 +119,25 @@ def remove_config(
 ):
     """Remove one or more config entries (/config/remove)."""
     url = resolve_api_url(api_url)
-    key_list = [k.strip() for k in keys.split(',') if k.strip()]
-    results = []
-    for key in key_list:
-        r = requests.delete(
+    key_list = _split_csv(keys)
+    if not key_list:
+        return
+    session = get_session()
+
+    def _delete_one(key):
+        return key, session.delete(
             f"{url}/config/remove",
             params={"key": key, "scope": scope}
         )
+
+    # Deletes are independent; issue them concurrently over the pooled
+    # session. ex.map preserves key_list order for the output below.
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(8, len(key_list))) as ex:
+        responses = list(ex.map(_delete_one, key_list))
+
+    results = []
+    for key, r in responses:
         if not r.ok:
             typer.secho(f"{key}: {r.text}", fg="red", err=True)
             results.append((key, False))
@@ -123,11 +155,11 @@ def remove_all_config(
 ):
     """Remove ALL config entries in a given scope (/config/remove_all)."""
     url = resolve_api_url(api_url)
-    r = requests.delete(f"{url}/config/remove_all", params={"scope": scope})
+    r = get_session().delete(f"{url}/config/remove_all", params={"scope": scope})
     if not r.ok:
         typer.secho(r.text, fg="red", err=True)
         raise typer.Exit(1)
-    typer.echo(json.dumps(r.json(), indent=2))
+    typer.echo(_dumps(r.json()))
 
 @app.command("bulk-get")
 def bulk_get_config(
@@ -137,12 +169,12 @@ def bulk_get_config(
 ):
     """Bulk get config entries (/config/bulk_get)."""
     url = resolve_api_url(api_url)
-    key_list = [k.strip() for k in keys.split(',') if k.strip()]
-    r = requests.post(f"{url}/config/bulk_get", json={"keys": key_list, "scope": scope})
+    key_list = _split_csv(keys)
+    r = get_session().post(f"{url}/config/bulk_get", json={"keys": key_list, "scope": scope})
     if not r.ok:
         typer.secho(r.text, fg="red", err=True)
         raise typer.Exit(1)
-    typer.echo(json.dumps(r.json(), indent=2))
+    typer.echo(_dumps(r.json()))
 
 @app.command("bulk-set")
 def bulk_set_config(
@@ -153,15 +185,15 @@ def bulk_set_config(
     """Bulk set config entries (/config/bulk_set)."""
     url = resolve_api_url(api_url)
     try:
-        obj = json.loads(items)
+        obj = _loads(items)
     except Exception:
         typer.secho("Could not parse argument as JSON object.", fg="red", err=True)
         raise typer.Exit(1)
-    r = requests.post(f"{url}/config/bulk_set", json={"items": obj, "scope": scope})
+    r = get_session().post(f"{url}/config/bulk_set", json={"items": obj, "scope": scope})
     if not r.ok:
         typer.secho(r.text, fg="red", err=True)
         raise typer.Exit(1)
-    typer.echo(json.dumps(r.json(), indent=2))
+    typer.echo(_dumps(r.json()))
 
 @app.command("remove-many")
 def remove_many_config(
@@ -171,12 +203,12 @@ def remove_many_config(
 ):
     """Remove multiple config entries in a single request (/config/remove_many)."""
     url = resolve_api_url(api_url)
-    key_list = [k.strip() for k in keys.split(',') if k.strip()]
-    r = requests.delete(f"{url}/config/remove_many", json={"keys": key_list, "scope": scope})
+    key_list = _split_csv(keys)
+    r = get_session().delete(f"{url}/config/remove_many", json={"keys": key_list, "scope": scope})
     if not r.ok:
         typer.secho(r.text, fg="red", err=True)
         raise typer.Exit(1)
-    typer.echo(json.dumps(r.json(), indent=2))
+    typer.echo(_dumps(r.json()))
 
 @app.command("health")
 def health(
@@ -185,11 +217,11 @@ def health(
     """Liveness/readiness probe (/health)."""
     url = resolve_api_url(api_url)
     try:
-        r = requests.get(f"{url}/health")
+        r = get_session().get(f"{url}/health")
         if not r.ok:
             typer.secho(json.dumps({"error": f"{r.status_code} {r.text}"}), fg="red", err=True)
             raise typer.Exit(1)
-        typer.echo(json.dumps(r.json(), indent=2))
+        typer.echo(_dumps(r.json()))
     except Exception as e:
         typer.secho(json.dumps({"error": str(e)}), fg="red", err=True)
         raise typer.Exit(1)
@@ -201,11 +233,11 @@ def scopes(
     """List all config scopes (/config/scopes)."""
     url = resolve_api_url(api_url)
     try:
-        r = requests.get(f"{url}/config/scopes")
+        r = get_session().get(f"{url}/config/scopes")
         if not r.ok:
             typer.secho(json.dumps({"error": f"{r.status_code} {r.text}"}), fg="red", err=True)
             raise typer.Exit(1)
-        typer.echo(json.dumps(r.json(), indent=2))
+        typer.echo(_dumps(r.json()))
     except Exception as e:
         typer.secho(json.dumps({"error": str(e)}), fg="red", err=True)
         raise typer.Exit(1)
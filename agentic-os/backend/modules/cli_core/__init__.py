@@ -1,7 +1,14 @@
 # modules/cli_core/__init__.py
 
+import os
+
 # Apply all patches immediately (monkey-patch click/typer internals)
 from .patch import *
+from .patch import _apply_legacy_patches
+
+# Pre-Click-8 compatibility shims are opt-in; supported installs skip them
+if os.environ.get("SOLVIN_LEGACY_CLICK") == "1":
+    _apply_legacy_patches()
 
 # Re-export banner utilities and HTTP timeout
 from .utils import banner, set_no_banner, set_http_timeout
@@ -9,6 +9,7 @@ import typer
 from typer import Context, Option
 
 from .utils import banner, set_no_banner, set_http_timeout
+from .utils import _STDOUT_IS_TTY as _IS_TTY
 
 VERSION = "1.1.0"
 logger = logging.getLogger("cli_core")
@@ -28,7 +29,7 @@ class BannerGroup(typer.core.TyperGroup):
         (via --help, no‐args, or after a parse error).
         We show the banner *once* here, then defer to Click.
         """
-        if sys.stdout.isatty():
+        if _IS_TTY:
             banner()
         super().format_help(ctx, formatter)
 
@@ -58,7 +59,7 @@ class BannerGroup(typer.core.TyperGroup):
             raise
         except Exception as exc:
             # truly unexpected error: one banner, one help
-            if sys.stdout.isatty():
+            if _IS_TTY:
                 banner()
             click.secho(f"Error: {exc}", fg="red", err=True)
 
@@ -100,14 +101,14 @@ def global_callback(
 
     # 4) --version: show banner + version, then exit(0)
     if version:
-        if sys.stdout.isatty():
+        if _IS_TTY:
             banner()
         typer.echo(f"Solvin CLI v{VERSION}")
         raise typer.Exit()
 
     # 5) invoked no subcommand at all: show banner + root help, then exit(0)
     if ctx.invoked_subcommand is None:
-        if sys.stdout.isatty():
+        if _IS_TTY:
             banner()
         typer.echo(ctx.get_help())
         raise typer.Exit()
@@ -0,0 +1,42 @@
+# modules/cli_core/http.py
+
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .utils import get_http_timeout
+
+
+class TimeoutSession(requests.Session):
+    """
+    requests.Session that applies the global --timeout (see
+    utils.set_http_timeout) to every request that doesn't pass its own.
+    """
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", get_http_timeout())
+        return super().request(method, url, **kwargs)
+
+
+_session: Optional[TimeoutSession] = None
+
+def get_session() -> TimeoutSession:
+    """
+    Return the process-wide CLI session, creating it on first use.
+    Its pooled adapter keeps connections alive across requests and
+    retries transient connection failures with a short backoff.
+    """
+    global _session
+    if _session is None:
+        _session = TimeoutSession()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            pool_block=False,
+            max_retries=Retry(total=2, backoff_factor=0.1),
+        )
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
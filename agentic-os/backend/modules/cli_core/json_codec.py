@@ -0,0 +1,30 @@
+# modules/cli_core/json_codec.py
+
+"""
+JSON helpers for CLI output and JSON-valued options. Uses orjson (a
+declared dependency) and falls back to the stdlib json module where it
+isn't installed.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> str:
+    """Render obj as 2-space indented JSON."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(obj, indent=2)
+
+
+def loads(text):
+    """Parse JSON text (str or bytes)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
@@ -8,13 +8,18 @@ from click.formatting import HelpFormatter
 # ——————————————————————————————————————————————————————
 # 1) For Click <8.0.0: strip unsupported kwargs from Context.__init__
 #    so that context_settings={'no_args_is_help':True} etc. don't blow up.
+#    We require Click >=8, so this only runs when SOLVIN_LEGACY_CLICK=1
+#    (see cli_core/__init__.py); normal startup never parses the version.
 # ——————————————————————————————————————————————————————
-try:
-    vers = tuple(int(x) for x in click.__version__.split('.')[:3])
-except Exception:
-    vers = (0, 0, 0)
+def _apply_legacy_patches() -> None:
+    try:
+        vers = tuple(int(x) for x in click.__version__.split('.')[:3])
+    except Exception:
+        vers = (0, 0, 0)
+
+    if vers >= (8, 0, 0):
+        return
 
-if vers < (8, 0, 0):
     _orig_ctx_init = _ClickContext.__init__
 
     def _patched_ctx_init(self, *args, **kwargs):
@@ -28,6 +33,8 @@ if vers < (8, 0, 0):
 
 # ——————————————————————————————————————————————————————
 # 2) Fix Typer/Click mismatch: allow Parameter.make_metavar(ctx=None)
+#    Click 8.2 made `ctx` required while Typer 0.15 still calls
+#    make_metavar() without it, so this shim is load-bearing.
 # ——————————————————————————————————————————————————————
 _orig_make_metavar = _ClickParameter.make_metavar
 
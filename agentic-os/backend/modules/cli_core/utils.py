@@ -10,6 +10,19 @@ from typing import Optional
 # ——— Banner control —————————————————————————————
 _no_banner = False
 
+# stdout's tty-ness is fixed for the life of the process; probe it once
+_STDOUT_IS_TTY = sys.stdout.isatty()
+
+_BANNER = r"""
+ ____        _       _
+/ ___|  ___ | |_   _(_)_ __
+\___ \ / _ \| \ \ / / | '_ \
+ ___) | (_) | |\ V /| | | | |
+|____/ \___/|_| \_/ |_|_| |_|
+
+"""
+_BANNER_BYTES = _BANNER.encode("ascii")
+
 def set_no_banner(flag: bool) -> None:
     """
     Globally suppress future banner() calls when flag is True.
@@ -21,20 +34,23 @@ def banner() -> None:
     """
     Print the ASCII banner only when stdout is a TTY and not suppressed.
     """
-    if _no_banner or not sys.stdout.isatty():
+    if _no_banner or not _STDOUT_IS_TTY:
         return
-    sys.stdout.write(r"""
- ____        _       _
-/ ___|  ___ | |_   _(_)_ __
-\___ \ / _ \| \ \ / / | '_ \
- ___) | (_) | |\ V /| | | | |
-|____/ \___/|_| \_/ |_|_| |_|
-
-""")
+    if sys.stdout is sys.__stdout__:
+        sys.stdout.flush()      # keep ordering with any pending text output
+        try:
+            # one unbuffered write(2) straight to fd 1
+            os.write(1, _BANNER_BYTES)
+            return
+        except OSError:
+            pass
+    # stdout replaced (or fd 1 unusable): go through the text layer
+    sys.stdout.write(_BANNER)
     sys.stdout.flush()
 
 # ——— HTTP timeout global —————————————————————————
 _http_timeout: Optional[float] = None
+_requests_patched = False
 
 def set_http_timeout(sec: float) -> None:
     """
@@ -42,6 +58,7 @@ def set_http_timeout(sec: float) -> None:
     """
     global _http_timeout
     _http_timeout = sec
+    _patch_requests_default_timeout()
 
 def get_http_timeout() -> Optional[float]:
     """
@@ -49,9 +66,21 @@ def get_http_timeout() -> Optional[float]:
     """
     return _http_timeout
 
-# Monkey‐patch requests.Session.request to inject our timeout by default
-try:
-    import requests
+def _patch_requests_default_timeout() -> None:
+    """
+    CLI-owned sessions (cli_core.http.TimeoutSession) apply the timeout
+    themselves. The shared clients call requests.get/post directly, so for
+    them we wrap requests.Session.request -- but only once a timeout has
+    actually been configured, leaving the default path untouched.
+    """
+    global _requests_patched
+    if _requests_patched:
+        return
+    try:
+        import requests
+    except ImportError:
+        # requests not installed → skip
+        return
 
     _orig_request = requests.Session.request
 
@@ -61,10 +90,7 @@ try:
         return _orig_request(self, method, url, *args, **kwargs)
 
     requests.Session.request = _timeout_request
-
-except ImportError:
-    # requests not installed → skip
-    pass
+    _requests_patched = True
 
 # ——— Logging fallback ————————————————————————————
 try:
@@ -85,15 +111,19 @@ except ImportError:
     import tty
     import termios
 
+# like stdout above, stdin's tty-ness is probed once per process
+_STDIN_IS_TTY = sys.stdin is not None and sys.stdin.isatty()
+
 def _getch() -> str:
     """
     Read a single character from stdin (blocking).
     """
     if WINDOWS:
         return msvcrt.getch().decode("utf-8", "ignore")
+    if not _STDIN_IS_TTY:
+        # piped/redirected input: no raw mode needed ("" at EOF)
+        return sys.stdin.read(1)
     fd = sys.stdin.fileno()
-    if not os.isatty(fd):
-        return ""
     old = termios.tcgetattr(fd)
     try:
         tty.setraw(fd)
@@ -101,85 +131,170 @@ def _getch() -> str:
     finally:
         termios.tcsetattr(fd, termios.TCSADRAIN, old)
 
-def _getch_nonblocking() -> Optional[str]:
+def _sleep_until(deadline: float) -> None:
     """
-    Attempt to read a single character without blocking; return None if none available.
+    Sleep until the absolute time.monotonic() `deadline`.
+    The remaining time is recomputed from the absolute target after every
+    wake-up, so interrupted sleeps never accumulate drift.  (time.sleep
+    itself resumes after EINTR and, on Linux, sleeps on CLOCK_MONOTONIC.)
+    """
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(remaining)
+
+# how often Windows checks kbhit() while waiting (it has no select() on consoles)
+_KBHIT_POLL = 0.05
+
+def _wait_key(fd: Optional[int], timeout: Optional[float]) -> Optional[str]:
+    """
+    Block until a key is pressed or `timeout` seconds pass (None = no
+    limit); return the key, None on timeout or for a byte that isn't a
+    whole character (e.g. a lead byte of UTF-8, or a Windows special key),
+    or "" once stdin hits EOF.
+    `fd` is the stdin descriptor; pass None to just sleep for `timeout`.
     """
     if WINDOWS:
-        return msvcrt.getch().decode("utf-8", "ignore") if msvcrt.kbhit() else None
-    dr, _, _ = select.select([sys.stdin], [], [], 0)
-    if dr and sys.stdin in dr:
-        return sys.stdin.read(1)
-    return None
+        end = None if timeout is None else time.monotonic() + timeout
+        while not msvcrt.kbhit():
+            now = time.monotonic()
+            if end is not None and now >= end:
+                return None
+            _sleep_until(now + _KBHIT_POLL if end is None else min(end, now + _KBHIT_POLL))
+        b = msvcrt.getch()
+        if b in (b"\x00", b"\xe0"):
+            # arrow/function keys arrive as a prefix plus a scan code; drop
+            # both so the scan code isn't read as a letter
+            msvcrt.getch()
+            return None
+        return b.decode("utf-8", "ignore") or None
+    if fd is None:
+        _sleep_until(time.monotonic() + timeout)
+        return None
+    dr, _, _ = select.select([fd], [], [], timeout)
+    if not dr:
+        return None
+    b = os.read(fd, 1)
+    if not b:
+        return ""
+    return b.decode("utf-8", "ignore") or None
 
 def _interruptible_countdown(total_seconds: float) -> None:
     """
     Countdown timer that can be paused (p), quit (q), or skipped (s).
+    Timing runs off one absolute monotonic deadline. We only wake when the
+    displayed whole-second count changes or a key arrives; while paused we
+    block in select() with no timeout at all.
     """
     remaining = float(total_seconds)
+    deadline = time.monotonic() + remaining
     paused = False
-    start = time.monotonic()
     longest = 0
 
-    while remaining > 0:
-        now = time.monotonic()
-        if not paused:
-            remaining = total_seconds - (now - start)
-            msg = f"Continuing in {int(remaining)+1}s (p=pause, q=quit, s=skip)"
-        else:
-            msg = "Paused (p=resume, q=quit, s=skip)"
-        sys.stdout.write(f"{msg:<{longest}}\r")
-        sys.stdout.flush()
-        longest = max(longest, len(msg))
-
-        key = _getch_nonblocking()
-        if key:
-            sys.stdout.write(" " * longest + "\r")
+    # cbreak once for the whole countdown so single keys arrive unbuffered
+    fd = old = None
+    if not WINDOWS:
+        fd = tty_fd = sys.stdin.fileno()
+        if _STDIN_IS_TTY:
+            old = termios.tcgetattr(tty_fd)
+            tty.setcbreak(tty_fd)
+    try:
+        while True:
+            now = time.monotonic()
+            if not paused:
+                remaining = deadline - now
+                if remaining <= 0:
+                    break
+                msg = f"Continuing in {int(remaining)+1}s (p=pause, q=quit, s=skip)"
+            else:
+                msg = "Paused (p=resume, q=quit, s=skip)"
+            sys.stdout.write(f"{msg:<{longest}}\r")
             sys.stdout.flush()
-            kl = key.lower()
-            if kl == "q":
-                sys.exit(0)
-            if kl == "p":
-                paused = not paused
-                if not paused:
-                    start = time.monotonic()
+            longest = max(longest, len(msg))
+
+            if paused:
+                timeout = None
+            else:
+                # sleep until "Continuing in Ns" next changes (or the deadline)
+                wake = now + (remaining % 1.0 or 1.0)
+                timeout = max(0.0, wake - time.monotonic())
+            key = _wait_key(fd, timeout)
+            if key == "":
+                # stdin is exhausted; keep counting without watching it.
+                # Nothing can resume us any more, so drop out of pause.
+                fd = None
+                if paused:
+                    paused = False
+                    deadline = time.monotonic() + remaining
                 continue
-            if kl == "s":
-                print("Skipped.", flush=True)
-                return
-        time.sleep(0.1)
+            if key:
+                sys.stdout.write(" " * longest + "\r")
+                sys.stdout.flush()
+                kl = key.lower()
+                if kl == "q":
+                    sys.exit(0)
+                if kl == "p":
+                    paused = not paused
+                    if paused:
+                        # freeze what's left; resuming re-anchors the deadline
+                        remaining = max(0.0, deadline - time.monotonic())
+                    else:
+                        deadline = time.monotonic() + remaining
+                    continue
+                if kl == "s":
+                    print("Skipped.", flush=True)
+                    return
+    finally:
+        if old is not None:
+            termios.tcsetattr(tty_fd, termios.TCSADRAIN, old)
 
     sys.stdout.write("\n")
 
+def _prompt_pause(turn: int, sleep_time: float) -> None:
+    prompt = (
+        f"Turn {turn}: press any key "
+        f"(q=quit, s=skip, p={sleep_time}s timer) "
+    )
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    ch = _getch()
+    print()
+    if not ch:
+        return
+    cl = ch.lower()
+    if cl == "q":
+        sys.exit(0)
+    if cl == "s":
+        return
+    if cl == "p":
+        print(f"Timer {sleep_time}s…")
+        _interruptible_countdown(sleep_time)
+
+def _timer_pause(turn: int, sleep_time: float) -> None:
+    try:
+        _interruptible_countdown(sleep_time)
+    except Exception:
+        pass
+
+def _no_pause(turn: int, sleep_time: float) -> None:
+    pass
+
+# mode → handler; anything unrecognised behaves like 'prompt'
+_PAUSE_HANDLERS = {
+    "prompt": _prompt_pause,
+    "timer":  _timer_pause,
+    "off":    _no_pause,
+}
+
+# INTERACTIVE_MODE is read once; per-turn calls only do a dict lookup
+_DEFAULT_PAUSE = _PAUSE_HANDLERS.get(
+    os.getenv("INTERACTIVE_MODE", "prompt").lower(), _prompt_pause
+)
+
 def interactive_pause(turn: int, mode: Optional[str] = None, sleep_time: float = 3.0) -> None:
     """
     Pause interactively between turns. Modes: 'prompt' (default), 'timer', or 'off'.
     """
-    mode = (mode or os.getenv("INTERACTIVE_MODE", "prompt")).lower()
-    if mode not in ("off", "timer"):
-        prompt = (
-            f"Turn {turn}: press any key "
-            f"(q=quit, s=skip, p={sleep_time}s timer) "
-        )
-        sys.stdout.write(prompt)
-        sys.stdout.flush()
-        ch = _getch()
-        print()
-        if not ch:
-            return
-        cl = ch.lower()
-        if cl == "q":
-            sys.exit(0)
-        if cl == "s":
-            return
-        if cl == "p":
-            print(f"Timer {sleep_time}s…")
-            _interruptible_countdown(sleep_time)
-        return
-
-    if mode == "timer":
-        try:
-            _interruptible_countdown(sleep_time)
-        except Exception:
-            pass
-    # mode == "off": do nothing
+    handler = _PAUSE_HANDLERS.get(mode.lower(), _prompt_pause) if mode else _DEFAULT_PAUSE
+    handler(turn, sleep_time)
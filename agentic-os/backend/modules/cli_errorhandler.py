@@ -4,29 +4,41 @@ import os
 import sys
 import typer
 import traceback
+from typing import Optional
 from modules.cli_core import banner
 
-# Try to import common HTTP/network exception types
-try:
-    from requests.exceptions import RequestException as _ReqExc, ConnectionError as _ReqConnErr
-except ImportError:
-    _ReqExc = _ReqConnErr = None
-
-try:
-    import httpx
-    _HttpxErr = httpx.HTTPError
-except ImportError:
-    _HttpxErr = None
-
-try:
-    import urllib3.exceptions as _u3exc
-    _U3Err = _u3exc.HTTPError
-except ImportError:
-    _U3Err = None
-
 from urllib.error import URLError as _URLErr
 import socket
 
+# Network exception types from optional HTTP libraries, as
+# (module name, exception attribute). Resolved on first use only.
+_NET_EXC_SOURCES = (
+    ("requests.exceptions", "ConnectionError"),
+    ("requests.exceptions", "RequestException"),
+    ("httpx",               "HTTPError"),
+    ("urllib3.exceptions",  "HTTPError"),
+)
+_NET_EXC: Optional[tuple] = None
+
+def _get_network_errors() -> tuple:
+    """
+    Build (once) the tuple of exception classes treated as "backend not
+    reachable". Only libraries that are already imported are consulted:
+    an exception can't come from a library the process never loaded, so
+    there is no reason to import requests/httpx/urllib3 just to check.
+    """
+    global _NET_EXC
+    if _NET_EXC is None:
+        found = []
+        for mod_name, attr in _NET_EXC_SOURCES:
+            mod = sys.modules.get(mod_name)
+            exc = getattr(mod, attr, None) if mod is not None else None
+            if exc is not None:
+                found.append(exc)
+        found.extend([_URLErr, ConnectionRefusedError, socket.timeout])
+        _NET_EXC = tuple(found)
+    return _NET_EXC
+
 # This flag will be flipped by the --debug CLI option
 DEBUG = False
 
@@ -50,9 +62,8 @@ def bannering_handle_exception(exc_type, exc_value, exc_traceback):
       3) Network/connection errors
       4) Fallback for anything else (with optional full traceback)
     """
-    # 0) Print banner if interactive
-    if sys.stdout.isatty():
-        banner()
+    # 0) Print banner if interactive (banner() checks the cached tty state)
+    banner()
 
     # 1) Missing SERVICE_URL_AGENTS
     if exc_type is KeyError and "SERVICE_URL_AGENTS" in str(exc_value):
@@ -66,18 +77,7 @@ def bannering_handle_exception(exc_type, exc_value, exc_traceback):
         sys.exit(1)
 
     # 3) Backend‐unavailable / network errors
-    network_errors = []
-    if _ReqConnErr:
-        network_errors.append(_ReqConnErr)
-    if _ReqExc:
-        network_errors.append(_ReqExc)
-    if _HttpxErr:
-        network_errors.append(_HttpxErr)
-    if _U3Err:
-        network_errors.append(_U3Err)
-    network_errors.extend([_URLErr, ConnectionRefusedError, socket.timeout])
-
-    if isinstance(exc_value, tuple(network_errors)):
+    if isinstance(exc_value, _get_network_errors()):
         typer.echo("❌ Backend service is not reachable.")
         typer.echo("   Please verify the service is up and network is OK.")
         sys.exit(1)
@@ -6,35 +6,42 @@ This tool uses the ReposClient to interact with the repos service.
 """
 
 import json
+import functools
 import typer
 from typing import Optional, Dict, Any
 
 from shared.config import config
 config["SERVICE_NAME"] = "cli"
 
-from shared.client_repos import (
-    ReposClient,
-    ReposClientError,
-    ReposClientConflict,
-)
 
-# Allow override of the repos‐service URL from config
-_api_url = config.get("SERVICE_URL_REPOS", None)
-_client_kwargs: Dict[str, Any] = {}
-if _api_url:
-    _client_kwargs["api_url"] = _api_url
+@functools.lru_cache(maxsize=1)
+def _client():
+    """
+    Build the ReposClient on first use. Resolving its config (which may
+    hit the configs service) and importing requests is deferred until a
+    command actually talks to the repos service, so `--help` stays cheap.
+    """
+    from shared.client_repos import ReposClient
+    from modules.cli_core.http import get_session
+
+    # Allow override of the repos‐service URL from config
+    api_url = config.get("SERVICE_URL_REPOS", None)
+    client_kwargs: Dict[str, Any] = {}
+    if api_url:
+        client_kwargs["api_url"] = api_url
 
-# Optionally override timeout via config (seconds, float or (connect, read))
-_timeout = config.get("REPOS_CLIENT_TIMEOUT_SEC", None)
-if _timeout is not None:
-    _client_kwargs["timeout"] = _timeout
+    # Optionally override timeout via config (seconds, float or (connect, read))
+    timeout = config.get("REPOS_CLIENT_TIMEOUT_SEC", None)
+    if timeout is not None:
+        client_kwargs["timeout"] = timeout
 
-client = ReposClient(**_client_kwargs)
+    return ReposClient(session=get_session(), **client_kwargs)
 
 app = typer.Typer(help="Repository management commands.")
 
 
 def _handle_error(exc: Exception, on_conflict: str = None):
+    from shared.client_repos import ReposClientError, ReposClientConflict
     if isinstance(exc, ReposClientConflict):
         msg = f"Conflict: {exc}"
         typer.secho(msg, fg="yellow")
@@ -51,7 +58,7 @@ def _handle_error(exc: Exception, on_conflict: str = None):
 def root():
     """GET / (root health‐check)."""
     try:
-        result = client.root()
+        result = _client().root()
         typer.echo(json.dumps(result, indent=2))
     except Exception as e:
         _handle_error(e)
@@ -61,7 +68,7 @@ def root():
 def health():
     """GET /health (liveness)."""
     try:
-        result = client.health()
+        result = _client().health()
         typer.secho(json.dumps(result, indent=2), fg="green")
     except Exception as e:
         _handle_error(e)
@@ -71,7 +78,7 @@ def health():
 def ready():
     """GET /ready (readiness)."""
     try:
-        result = client.ready()
+        result = _client().ready()
         typer.secho(json.dumps(result, indent=2), fg="green")
     except Exception as e:
         _handle_error(e)
@@ -81,7 +88,7 @@ def ready():
 def status():
     """GET /status (metrics & status)."""
     try:
-        result = client.status()
+        result = _client().status()
         typer.echo(json.dumps(result, indent=2))
     except Exception as e:
         _handle_error(e)
@@ -91,7 +98,7 @@ def status():
 def list_repos():
     """List all repositories."""
     try:
-        repos = client.list_repos()
+        repos = _client().list_repos()
         typer.echo(json.dumps(repos, indent=2))
     except Exception as e:
         _handle_error(e)
@@ -101,7 +108,7 @@ def list_repos():
 def info(repo_url: str = typer.Argument(..., help="Repository URL")):
     """Show details about a repository."""
     try:
-        detail = client.get_repo_info(repo_url)
+        detail = _client().get_repo_info(repo_url)
         typer.echo(json.dumps(detail, indent=2))
     except Exception as e:
         _handle_error(e)
@@ -120,7 +127,7 @@ def admit(
     """
     typer.echo(f"Admitting repository from URL: {repo_url!r} …")
     try:
-        result = client.admit_repo(
+        result = _client().admit_repo(
             repo_url=repo_url,
             team_id=team_id,
             priority=priority,
@@ -147,7 +154,7 @@ def admit_bulk(
         raise typer.Exit(code=1)
 
     try:
-        result = client.admit_bulk(payload)
+        result = _client().admit_bulk(payload)
         typer.secho("Bulk admit successful!", fg="green")
         typer.echo(json.dumps(result, indent=2))
     except Exception as e:
@@ -182,7 +189,7 @@ def add(
         f"(owner={repo_owner}, team={team_id}) …"
     )
     try:
-        result = client.add_repo(
+        result = _client().add_repo(
             repo_url=repo_url,
             repo_name=repo_name,
             repo_owner=repo_owner,
@@ -213,7 +220,7 @@ def add_bulk(
         raise typer.Exit(code=1)
 
     try:
-        result = client.add_bulk(payload)
+        result = _client().add_bulk(payload)
         typer.secho("Bulk add successful!", fg="green")
         typer.echo(json.dumps(result, indent=2))
     except Exception as e:
@@ -226,7 +233,7 @@ def claim(
 ):
     """Claim the next available repository for processing (non‐blocking)."""
     try:
-        claim = client.claim_repo(ttl=ttl)
+        claim = _client().claim_repo(ttl=ttl)
         typer.echo(json.dumps(claim, indent=2))
     except Exception as e:
         _handle_error(e)
@@ -234,15 +241,18 @@ def claim(
 
 @app.command("claim-blocking")
 def claim_blocking(
-    timeout: float = typer.Option(
-        config.get("QUEUE_TIMEOUT_SEC", 30.0),
+    timeout: Optional[float] = typer.Option(
+        None,
         "--timeout", "-t",
-        help="Max seconds to wait for an available repo",
+        help="Max seconds to wait for an available repo (default: QUEUE_TIMEOUT_SEC or 30)",
     )
 ):
     """Block until a repository becomes available or timeout."""
+    if timeout is None:
+        # resolved here, not at import, since it may query the configs service
+        timeout = float(config.get("QUEUE_TIMEOUT_SEC", 30.0))
     try:
-        claim = client.claim_repo_blocking(timeout=timeout)
+        claim = _client().claim_repo_blocking(timeout=timeout)
         typer.echo(json.dumps(claim, indent=2))
     except Exception as e:
         _handle_error(e)
@@ -252,7 +262,7 @@ def claim_blocking(
 def complete(repo_url: str = typer.Argument(..., help="Repository URL to complete")):
     """Mark a claimed repository as complete and remove it."""
     try:
-        resp = client.complete_repo(repo_url)
+        resp = _client().complete_repo(repo_url)
         typer.echo(json.dumps(resp, indent=2))
     except Exception as e:
         _handle_error(e)
@@ -270,7 +280,7 @@ def complete_bulk(
         raise typer.Exit(code=1)
 
     try:
-        resp = client.complete_bulk(urls)
+        resp = _client().complete_bulk(urls)
         typer.echo(json.dumps(resp, indent=2))
     except Exception as e:
         _handle_error(e)
@@ -285,7 +295,7 @@ def delete(
 ):
     """Delete a repository from filesystem, optionally also from the database."""
     try:
-        result = client.delete_repo(repo_url, remove_db=remove_db)
+        result = _client().delete_repo(repo_url, remove_db=remove_db)
         typer.secho("Deleted successfully!", fg="green")
         typer.echo(json.dumps(result, indent=2))
     except Exception as e:
@@ -14,6 +14,7 @@ from shared.logger import logger
 from shared.client_tools import execute_tool as nats_execute_tool, execute_bulk as nats_execute_bulk
 
 from modules.cli_core import BannerGroup, banner
+from modules.cli_core.http import get_session
 
 API_VERSION = "v1"
 API_PREFIX  = f"/api/{API_VERSION}"
@@ -36,6 +37,7 @@ class ToolsClient:
         # strip trailing slash, then add our /api/v1 prefix
         self.base    = base_url.rstrip("/") + API_PREFIX
         self.headers = {"Content-Type": "application/json"}
+        self.session = get_session()
 
     def _unwrap(self, resp: requests.Response) -> Any:
         resp.raise_for_status()
@@ -53,19 +55,19 @@ class ToolsClient:
         return env.get("data")
 
     def health_check(self) -> Dict[str, Any]:
-        r = requests.get(f"{self.base}/health", headers=self.headers)
+        r = self.session.get(f"{self.base}/health", headers=self.headers)
         return self._unwrap(r)
 
     def ready_check(self) -> Dict[str, Any]:
-        r = requests.get(f"{self.base}/ready", headers=self.headers)
+        r = self.session.get(f"{self.base}/ready", headers=self.headers)
         return self._unwrap(r)
 
     def status(self) -> Dict[str, Any]:
-        r = requests.get(f"{self.base}/status", headers=self.headers)
+        r = self.session.get(f"{self.base}/status", headers=self.headers)
         return self._unwrap(r)
 
     def list_tools(self) -> List[Dict[str, Any]]:
-        r = requests.get(f"{self.base}/tools/list", headers=self.headers)
+        r = self.session.get(f"{self.base}/tools/list", headers=self.headers)
         return self._unwrap(r)
 
     def tools_info(
@@ -80,10 +82,10 @@ class ToolsClient:
 
         if tool_names:
             payload = {"tool_names": tool_names}
-            r = requests.post(url, params=params, json=payload, headers=self.headers)
+            r = self.session.post(url, params=params, json=payload, headers=self.headers)
         elif tool_name:
             params["tool_name"] = tool_name
-            r = requests.get(url, params=params, headers=self.headers)
+            r = self.session.get(url, params=params, headers=self.headers)
         else:
             raise typer.BadParameter("Must supply --tool-name or --tool-names")
 
@@ -1,12 +1,13 @@
 # modules/agent_call_graph.py
 
 import threading
-from typing import Tuple, List
+from typing import Tuple, List, Dict
 
-# Thread‐safe global list of spawn edges.
+# Thread‐safe global set of spawn edges, kept in first-seen order
+# (a dict with None values: O(1) membership, insertion-ordered iteration).
 # Each edge is ((parent_role, parent_id), (child_role, child_id))
 _lock = threading.Lock()
-_edges: List[Tuple[Tuple[str, str], Tuple[str, str]]] = []
+_edges: Dict[Tuple[Tuple[str, str], Tuple[str, str]], None] = {}
 
 def record_spawn(
     parent: Tuple[str, str],
@@ -18,32 +19,37 @@ def record_spawn(
     """
     with _lock:
         # only record each edge once
-        if (parent, child) not in _edges:
-            _edges.append((parent, child))
+        _edges.setdefault((parent, child), None)
 
-def get_graph_edges() -> List[Tuple[Tuple[str, str], Tuple[str, str]]]:
+def get_graph_edges() -> Tuple[Tuple[Tuple[str, str], Tuple[str, str]], ...]:
     """
-    Return a snapshot of all recorded spawn edges.
+    Return an immutable snapshot of all recorded spawn edges.
     """
     with _lock:
-        return list(_edges)
+        return tuple(_edges)
 
 def format_mermaid_sequence() -> str:
     """
     Produce a Mermaid sequenceDiagram of the spawn graph.
+    Single pass over the edges: each participant gets its alias (and its
+    declaration line) the first time it is seen.
     """
     edges = get_graph_edges()
-    # collect unique participants
-    participants = {p for p, c in edges} | {c for p, c in edges}
-    lines: List[str] = ["sequenceDiagram"]
-    # declare participants
-    for role, aid in participants:
-        short = aid[:8]
-        alias = f"{role}_{short}"
-        lines.append(f'    participant {alias} as "{role}:{short}"')
-    # draw arrows
+    aliases: Dict[Tuple[str, str], str] = {}
+    parts: List[str] = ["sequenceDiagram"]
+    arrow_pairs: List[Tuple[str, str]] = []
+
+    def _alias(node: Tuple[str, str]) -> str:
+        alias = aliases.get(node)
+        if alias is None:
+            role, aid = node
+            short = aid[:8]
+            alias = aliases[node] = f"{role}_{short}"
+            parts.append(f'\n    participant {alias} as "{role}:{short}"')
+        return alias
+
     for parent, child in edges:
-        pr_alias = f"{parent[0]}_{parent[1][:8]}"
-        ch_alias = f"{child[0]}_{child[1][:8]}"
-        lines.append(f"    {pr_alias} ->> {ch_alias}: spawn")
-    return "\n".join(lines)
+        arrow_pairs.append((_alias(parent), _alias(child)))
+    # declare participants before drawing arrows
+    parts.extend(f"\n    {pa} ->> {ca}: spawn" for pa, ca in arrow_pairs)
+    return "".join(parts)
@@ -5,26 +5,61 @@ from typing import Optional, Tuple, List, Dict, Any
 
 from modules.db_agents import (
     list_running_agents    as db_list_running_agents,
+    running_agent_exists   as db_running_agent_exists,
+    get_running_agent      as db_get_running_agent,
     add_running_agent      as db_add_running_agent,
+    upsert_running_agent   as db_upsert_running_agent,
     remove_running_agent   as db_remove_running_agent,
 )
+from modules.turns_list import delete_turns_list
 
 # ─── Thread‐local context ─────────────────────────────────────────────────────
 
-_thread_ctx = threading.local()
+class _AgentThreadContext(threading.local):
+    """
+    Per-thread agent call-stack and current pointer. threading.local runs
+    __init__ once per thread on first touch, so callers never need to
+    check that the attributes exist.
+
+    agent_counts mirrors agent_stack as {tuple: occurrences} so membership
+    tests are O(1); a count (not a set) because the same agent can be
+    pushed more than once.
+
+    Every caller is synchronous (sync routers run on Starlette's threadpool,
+    run_agent_task runs on the caller's thread, async runs on the pool), so
+    a contextvars.ContextVar would buy nothing over threading.local here.
+    The context only lives as long as the code that set it on that thread:
+    it does not carry over between HTTP requests, which may land on any
+    threadpool thread. Pool workers re-install their parent explicitly.
+    """
+    def __init__(self):
+        self.agent_stack: List[Tuple[str, str, str]] = []
+        self.agent_counts: Dict[Tuple[str, str, str], int] = {}
+        self.current_agent: Optional[Tuple[str, str, str]] = None
+
+    def push(self, tup: Tuple[str, str, str]) -> None:
+        self.agent_stack.append(tup)
+        self.agent_counts[tup] = self.agent_counts.get(tup, 0) + 1
+
+    def pop(self) -> None:
+        tup = self.agent_stack.pop()
+        n = self.agent_counts[tup] - 1
+        if n:
+            self.agent_counts[tup] = n
+        else:
+            del self.agent_counts[tup]
+
+    def clear(self) -> None:
+        self.agent_stack = []
+        self.agent_counts = {}
 
-def _ensure_thread_ctx():
-    if not hasattr(_thread_ctx, "agent_stack"):
-        _thread_ctx.agent_stack = []                # type: List[Tuple[str,str,str]]
-    if not hasattr(_thread_ctx, "current_agent"):
-        _thread_ctx.current_agent = None            # type: Optional[Tuple[str,str,str]]
+_thread_ctx = _AgentThreadContext()
 
 def get_current_agent_tuple() -> Optional[Tuple[str, str, str]]:
     """
     Return (agent_role, agent_id, repo_url) for this thread, or None.
     """
-    _ensure_thread_ctx()
-    return _thread_ctx.current_agent    # type: ignore
+    return _thread_ctx.current_agent
 
 def set_thread_current_agent_tuple(
     agent_role: Optional[str],
@@ -35,14 +70,13 @@ def set_thread_current_agent_tuple(
     Update only the thread-local 'current_agent' pointer (and stack).
     Does NOT touch the DB.
     """
-    _ensure_thread_ctx()
     if agent_role and agent_id and repo_url:
         tup = (agent_role, agent_id, repo_url)
-        _thread_ctx.agent_stack.append(tup)
-        _thread_ctx.current_agent = tup    # type: ignore
+        _thread_ctx.push(tup)
+        _thread_ctx.current_agent = tup
     else:
-        _thread_ctx.agent_stack = []
-        _thread_ctx.current_agent = None   # type: ignore
+        _thread_ctx.clear()
+        _thread_ctx.current_agent = None
 
 
 # ─── Agent‐seeding logic ─────────────────────────────────────────────────────
@@ -55,7 +89,7 @@ def seed_agent(
     """
     Create (or reuse) exactly one agent row for (agent_role, repo_url).
 
-    Must be called with a non‐empty agent_id (MD5 computed upstream).
+    Must be called with a non‐empty agent_id (derived from the prompt upstream).
     Never uses any DB‐generated sequential IDs.
     Always sets the thread‐local current_agent pointer.
     """
@@ -66,10 +100,8 @@ def seed_agent(
         )
     aid = agent_id.strip()
 
-    # insert into DB only if missing
-    existing = db_list_running_agents(repo_url)
-    if not any(r["agent_role"] == agent_role and r["agent_id"] == aid for r in existing):
-        db_add_running_agent(agent_role, repo_url, aid)
+    # insert into DB only if missing (single INSERT ... ON CONFLICT DO NOTHING)
+    db_upsert_running_agent(agent_role, repo_url, aid)
 
     # update only the thread-local pointer
     set_thread_current_agent_tuple(agent_role, aid, repo_url)
@@ -80,9 +112,8 @@ def pop_current_agent() -> None:
     Remove the most‐recently pushed agent from this thread’s context,
     restoring its parent (or None).
     """
-    _ensure_thread_ctx()
     if _thread_ctx.agent_stack:
-        _thread_ctx.agent_stack.pop()
+        _thread_ctx.pop()
     if _thread_ctx.agent_stack:
         _thread_ctx.current_agent = _thread_ctx.agent_stack[-1]
     else:
@@ -127,10 +158,7 @@ def get_current_running_agent(
     role, aid, rurl = cur
     if repo_url and rurl != repo_url:
         return {}
-    for a in db_list_running_agents(rurl):
-        if a["agent_role"] == role and a["agent_id"] == aid:
-            return a
-    return {}
+    return db_get_running_agent(role, aid, rurl) or {}
 
 def set_current_agent(
     agent_role: str,
@@ -141,10 +169,7 @@ def set_current_agent(
     Make (role,agent_id,repo_url) the thread-local current.
     Must already exist in the DB.
     """
-    if not any(
-        a["agent_role"] == agent_role and a["agent_id"] == agent_id
-        for a in db_list_running_agents(repo_url)
-    ):
+    if not db_running_agent_exists(agent_role, agent_id, repo_url):
         raise RuntimeError(f"Agent {agent_role}:{agent_id} not found in repo '{repo_url}'")
 
     set_thread_current_agent_tuple(agent_role, agent_id, repo_url)
@@ -160,31 +185,23 @@ def remove_running_agent(
     """
     1) Forbid deleting any agent still in this thread’s call-stack.
     2) Delete from DB and purge its turn history.
-    3) If it was current, pop back to the parent.
+
+    The call-stack is thread-local, so nothing can push `target` between
+    the check and the DB work, and since a stacked agent is refused up
+    front there is never a pop to undo if the DB work fails.
     """
-    _ensure_thread_ctx()
     target = (agent_role, agent_id, repo_url)
 
     # cannot delete an in-flight/current agent
-    if target in _thread_ctx.agent_stack:
+    if target in _thread_ctx.agent_counts:
         raise RuntimeError("Cannot remove agent still in call-stack")
 
     # delete from DB
     count = db_remove_running_agent(agent_role, agent_id, repo_url)
 
     # delete its turn history
-    from modules.turns_list import delete_turns_list  # lazy import
     delete_turns_list(agent_role, agent_id, repo_url)
 
-    # restore previous if it was current
-    stack = _thread_ctx.agent_stack
-    if stack and stack[-1] == target:
-        stack.pop()
-        if stack:
-            set_thread_current_agent_tuple(*stack[-1])
-        else:
-            set_thread_current_agent_tuple(None, None, None)
-
     if count == 0:
         raise RuntimeError(f"No such running agent {agent_role}:{agent_id} in repo '{repo_url}'")
 
@@ -197,20 +214,18 @@ def get_agent_stack() -> List[Dict[str, str]]:
     Return this thread’s agent-call stack (bottom→top),
     including parent linkage.
     """
-    _ensure_thread_ctx()
-    out: List[Dict[str, str]] = []
-    for idx, (role, aid, repo) in enumerate(_thread_ctx.agent_stack):
-        rec: Dict[str, str] = {
-            "agent_role": role,
-            "agent_id":   aid,
-            "repo_url":   repo,
+    # one thread-local lookup, then work on a plain local snapshot
+    stack = tuple(_thread_ctx.agent_stack)
+    # each entry's parent is the one below it; the bottom has none
+    parents = [("", "")]
+    parents.extend((role, aid) for role, aid, _ in stack[:-1])
+    return [
+        {
+            "agent_role":  role,
+            "agent_id":    aid,
+            "repo_url":    repo,
+            "parent_role": pr,
+            "parent_id":   pa,
         }
-        if idx > 0:
-            pr, pa, _ = _thread_ctx.agent_stack[idx - 1]
-            rec["parent_role"] = pr
-            rec["parent_id"]   = pa
-        else:
-            rec["parent_role"] = ""
-            rec["parent_id"]   = ""
-        out.append(rec)
-    return out
+        for (role, aid, repo), (pr, pa) in zip(stack, parents)
+    ]
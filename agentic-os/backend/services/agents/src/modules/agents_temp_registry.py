@@ -6,11 +6,57 @@ Defines the AgentRegistryItem model and functions to list, upsert, get, and dele
 registry entries by agent_role.
 """
 
-from typing import List, Optional, Any, Union
+from typing import List, Optional, Any, Union, Dict, Tuple
+import threading
+import time
 import requests
-from pydantic import BaseModel, field_validator
+from requests.adapters import HTTPAdapter
+from pydantic import BaseModel, ConfigDict, TypeAdapter, field_validator
 from shared.config import config
-import json
+from modules.json_codec import loads as _loads
+
+# One pooled session for all registry calls, so keep-alive connections are
+# reused across requests instead of opening a new TCP/TLS connection each time.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_maxsize=32)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+# Short-lived read cache: registry entries change rarely but are read on
+# every seed/prompt build. Keys are the agent_role for single lookups and
+# None for the full listing; upserts/deletes invalidate what they touch.
+# The TTL is read on first use, not at import: an unset key would otherwise
+# query the configs service while this module is being imported.
+_CACHE_TTL: Optional[float] = None
+_cache_lock = threading.Lock()
+_cache: Dict[Optional[str], Tuple[float, Any]] = {}
+_MISS = object()
+
+
+def _cache_ttl() -> float:
+    global _CACHE_TTL
+    if _CACHE_TTL is None:
+        _CACHE_TTL = float(config.get("AGENT_REGISTRY_CACHE_TTL_SEC", 5.0))
+    return _CACHE_TTL
+
+
+def _cache_get(key: Optional[str]) -> Any:
+    with _cache_lock:
+        hit = _cache.get(key)
+    if hit is None or time.monotonic() - hit[0] >= _cache_ttl():
+        return _MISS
+    return hit[1]
+
+
+def _cache_put(key: Optional[str], value: Any) -> None:
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), value)
+
+
+def _cache_invalidate(agent_role: str) -> None:
+    with _cache_lock:
+        _cache.pop(agent_role, None)
+        _cache.pop(None, None)
 
 
 def get_agent_manager_api_url() -> str:
@@ -18,11 +64,27 @@ def get_agent_manager_api_url() -> str:
     return config["AGENT_MANAGER_API_URL"]
 
 
+_API_BASE: Optional[str] = None
+
+
 def get_registry_api_base() -> str:
-    return f"{get_agent_manager_api_url().rstrip('/')}/api/agent-roles"
+    # resolved on first use (the config lookup may hit the configs service)
+    global _API_BASE
+    if _API_BASE is None:
+        _API_BASE = f"{get_agent_manager_api_url().rstrip('/')}/api/agent-roles"
+    return _API_BASE
+
+
+def _reset_api_base() -> None:
+    """Forget the cached base URL (e.g. after AGENT_MANAGER_API_URL changes)."""
+    global _API_BASE
+    _API_BASE = None
 
 
 class AgentRegistryItem(BaseModel):
+    # immutable: cached instances are handed out to every caller
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     agent_role:               str
     agent_description:        Optional[str] = ""
     allowed_tools:            Any
@@ -38,8 +100,11 @@ class AgentRegistryItem(BaseModel):
     @field_validator('allowed_tools', mode='before')
     @classmethod
     def _ensure_list(cls, v):
+        if type(v) is list and all(type(i) is str for i in v):
+            # common shape from the API: already list[str]
+            return v
         if isinstance(v, str):
-            v = json.loads(v)
+            v = _loads(v)
         if not isinstance(v, list):
             raise ValueError(f"allowed_tools must be list, got {type(v).__name__}: {v!r}")
         if not all(isinstance(i, str) for i in v):
@@ -62,34 +127,32 @@ class AgentRegistryItem(BaseModel):
             return None
         return v
 
-    # ----------------------------------------------------------------
-    # Compatibility shim so you can treat this model like a dict:
-    # ----------------------------------------------------------------
-    def get(self, key: str, default=None):
-        return getattr(self, key, default)
 
-    def __getitem__(self, key: str):
-        try:
-            return getattr(self, key)
-        except AttributeError:
-            raise KeyError(key)
+# validates a whole listing in one call into pydantic-core (no per-item Python loop)
+_REG_LIST_ADAPTER = TypeAdapter(List[AgentRegistryItem])
 
 
 def list_registry() -> List[AgentRegistryItem]:
     """
     Fetch all entries from the remote registry.
     Handles the 'agentTypes' wrapper that the remote API returns.
+    Results are cached for _CACHE_TTL seconds.
     """
-    resp = requests.get(get_registry_api_base())
+    cached = _cache_get(None)
+    if cached is not _MISS:
+        return list(cached)
+    resp = _session.get(get_registry_api_base())
     resp.raise_for_status()
-    data = resp.json()
+    data = _loads(resp.content)
     if isinstance(data, dict) and "agentTypes" in data and isinstance(data["agentTypes"], list):
         raw_list = data["agentTypes"]
     elif isinstance(data, list):
         raw_list = data
     else:
         raise ValueError(f"Unexpected registry list response shape: {data}")
-    return [AgentRegistryItem.model_validate(item) for item in raw_list]
+    items = _REG_LIST_ADAPTER.validate_python(raw_list)
+    _cache_put(None, items)
+    return list(items)
 
 
 def upsert_agent_role(
@@ -104,13 +167,14 @@ def upsert_agent_role(
 ) -> AgentRegistryItem:
     """
     1) POST to upsert the registry entry,
-    2) GET the entry by agent_role (unwrapping the response as needed),
+    2) Take the stored entry from the POST's "agent" field (older servers
+       don't echo it; then GET it by agent_role),
     3) Merge in the POST's "message",
     4) Return a validated AgentRegistryItem.
     """
     # ensure allowed_tools is a list
     if isinstance(allowed_tools, str):
-        allowed_tools = json.loads(allowed_tools)
+        allowed_tools = _loads(allowed_tools)
 
     payload = {
         "agent_role":               agent_role,
@@ -125,20 +189,23 @@ def upsert_agent_role(
     if tool_choice is not None:
         payload["tool_choice"] = tool_choice
 
-    post_resp = requests.post(get_registry_api_base(), json=payload)
+    post_resp = _session.post(get_registry_api_base(), json=payload)
     post_resp.raise_for_status()
-    post_data = post_resp.json()  # e.g. { "message": "Agent role created/updated successfully." }
+    _cache_invalidate(agent_role)
+    post_data = _loads(post_resp.content)  # e.g. { "message": "...", "agent": {...} }
 
-    # fetch back the upserted entry
-    fetch_resp = requests.get(get_registry_api_base(), params={"agent_role": agent_role})
-    fetch_resp.raise_for_status()
-    entries = fetch_resp.json()
-    if isinstance(entries, dict) and "agent" in entries:
-        entry = entries["agent"]
-    elif isinstance(entries, list) and len(entries) == 1:
-        entry = entries[0]
-    else:
-        raise ValueError(f"Unexpected registry fetch response: {entries}")
+    entry = post_data.get("agent")
+    if not isinstance(entry, dict):
+        # fetch back the upserted entry
+        fetch_resp = _session.get(get_registry_api_base(), params={"agent_role": agent_role})
+        fetch_resp.raise_for_status()
+        entries = _loads(fetch_resp.content)
+        if isinstance(entries, dict) and "agent" in entries:
+            entry = entries["agent"]
+        elif isinstance(entries, list) and len(entries) == 1:
+            entry = entries[0]
+        else:
+            raise ValueError(f"Unexpected registry fetch response: {entries}")
 
     entry["message"] = post_data.get("message")
     return AgentRegistryItem.model_validate(entry)
@@ -152,12 +219,12 @@ def delete_agent_role(agent_role: str) -> dict:
     """
     url = get_registry_api_base()
 
-    fetch_resp = requests.get(url, params={"agent_role": agent_role})
+    fetch_resp = _session.get(url, params={"agent_role": agent_role})
     if fetch_resp.status_code == 404:
         return {"message": f"Agent role '{agent_role}' not found; nothing to delete."}
     fetch_resp.raise_for_status()
 
-    entries = fetch_resp.json()
+    entries = _loads(fetch_resp.content)
     if isinstance(entries, dict) and "agent" in entries:
         entry = entries["agent"]
     elif isinstance(entries, list) and len(entries) == 1:
@@ -165,8 +232,9 @@ def delete_agent_role(agent_role: str) -> dict:
     else:
         raise ValueError(f"No unique registry entry for role '{agent_role}': {entries}")
 
-    del_resp = requests.delete(url, params={"agent_role": agent_role})
+    del_resp = _session.delete(url, params={"agent_role": agent_role})
     del_resp.raise_for_status()
+    _cache_invalidate(agent_role)
     return {"message": f"Agent role '{agent_role}' deleted successfully."}
 
 
@@ -174,17 +242,20 @@ def get_agent_role(agent_role: str) -> Optional[AgentRegistryItem]:
     """
     Fetch a single agent registry entry by agent_role.
     Returns an AgentRegistryItem if found, else None.
+    Results (including misses) are cached for _CACHE_TTL seconds.
     """
-    resp = requests.get(get_registry_api_base(), params={"agent_role": agent_role})
+    cached = _cache_get(agent_role)
+    if cached is not _MISS:
+        return cached
+    resp = _session.get(get_registry_api_base(), params={"agent_role": agent_role})
     resp.raise_for_status()
-    data = resp.json()
+    data = _loads(resp.content)
     if isinstance(data, dict) and "agent" in data:
-        entry = data["agent"]
+        item = AgentRegistryItem.model_validate(data["agent"])
     elif isinstance(data, list) and len(data) == 1:
-        entry = data[0]
-    elif isinstance(data, list) and len(data) == 0:
-        return None
+        item = AgentRegistryItem.model_validate(data[0])
     else:
-        return None
+        item = None
 
-    return AgentRegistryItem.model_validate(entry)
+    _cache_put(agent_role, item)
+    return item
@@ -1,13 +1,24 @@
 # modules/db.py
 
 import os
+import atexit
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, List, Optional
 from shared.config import config
 
 # The single SQLite file for all agents‐and‐turns data
 DB_PATH = config["AGENTS_DB_FILE"]
 
+# Stamped into PRAGMA user_version once init_db() has applied the schema;
+# bump it whenever init_db() gains a table, column, index or migration.
+SCHEMA_VERSION = 3
+
+# INSERT/UPDATE/DELETE ... RETURNING needs SQLite 3.35+
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
 def ensure_db_dir():
     """
     Make sure the directory for DB_PATH exists.
@@ -16,27 +27,257 @@ def ensure_db_dir():
     if d and not os.path.exists(d):
         os.makedirs(d, exist_ok=True)
 
-@contextmanager
-def get_db():
+def ensure_agents_running_key(db: sqlite3.Connection) -> None:
+    """
+    Make (repo_url, agent_role, agent_id) unique in agents_running, so
+    seeding can be a single INSERT ... ON CONFLICT DO NOTHING.  Older DBs
+    may hold duplicate rows; keep the earliest of each before indexing.
+    """
+    if db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='index' AND name='uq_agents_running_key'"
+    ).fetchone():
+        return
+    db.execute("""
+    DELETE FROM agents_running
+     WHERE id NOT IN (
+        SELECT MIN(id) FROM agents_running
+         GROUP BY repo_url, agent_role, agent_id
+     );
+    """)
+    # superseded by the unique index below
+    db.execute("DROP INDEX IF EXISTS idx_agents_running_key;")
+    db.execute("""
+    CREATE UNIQUE INDEX uq_agents_running_key
+        ON agents_running (repo_url, agent_role, agent_id);
+    """)
+
+class _ThreadConn(threading.local):
+    """
+    Per-thread read-only connection plus this thread's get_db() nesting
+    depth, so only the outermost block takes the writer and commits, and
+    the callbacks queued by after_commit() until that block ends.
     """
-    Context‐manager yielding a sqlite3.Connection with foreign‐keys ON,
-    WAL mode, and a long busy timeout for concurrent test safety.
-    Commits on exit, rolls back on exception.
+    def __init__(self):
+        self.reader: Optional[sqlite3.Connection] = None
+        self.depth = 0
+        self.on_exit: List[Callable[[], None]] = []
+
+_tls = _ThreadConn()
+
+# One writer connection for the process; SQLite allows a single writer at
+# a time anyway, so serialising in Python avoids SQLITE_BUSY churn.
+_writer: Optional[sqlite3.Connection] = None
+_writer_lock = threading.Lock()
+
+# Prepared statements kept per connection (sqlite3 default is 128); the
+# helper modules hold their hot SQL in module constants so lookups hit.
+_STATEMENT_CACHE_SIZE = 256
+
+def _tune(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Apply the per-connection PRAGMAs shared by readers and the writer.
     """
-    ensure_db_dir()
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=30.0)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout = 30000;")  # 30s, waited out inside SQLite
+    conn.execute("PRAGMA cache_size = -64000;")   # ~64 MiB page cache
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA mmap_size = 268435456;") # 256 MiB memory-mapped reads
+    return conn
+
+def _connect_writer() -> sqlite3.Connection:
+    """
+    Open the read/write connection and apply the PRAGMAs (once).
+    """
+    # isolation_level=None: no implicit DEFERRED transactions; get_db()
+    # issues BEGIN IMMEDIATE itself
+    conn = _tune(sqlite3.connect(
+        DB_PATH, check_same_thread=False, isolation_level=None,
+        cached_statements=_STATEMENT_CACHE_SIZE,
+    ))
     conn.execute("PRAGMA foreign_keys = ON;")
     conn.execute("PRAGMA journal_mode = WAL;")
     conn.execute("PRAGMA synchronous = NORMAL;")  # For WAL, NORMAL is safe and improves speed
-    try:
-        yield conn
-        conn.commit()
-    except:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+    conn.execute("PRAGMA wal_autocheckpoint = 1000;")
+    conn.execute("PRAGMA analysis_limit = 1000;") # bounds each PRAGMA optimize
+    _schedule_optimize()
+    return conn
+
+def _schedule_optimize() -> None:
+    """
+    Start a daemon thread that runs PRAGMA optimize on the writer, so a
+    long-lived worker re-analyzes tables whose sizes have drifted.
+    """
+    threading.Thread(
+        target=_periodic_optimize, name="agents-db-optimize", daemon=True
+    ).start()
+
+def _periodic_optimize() -> None:
+    # read on this thread: the writer is opened while the module is
+    # imported, and importing db must not hit the configs service
+    interval = float(config.get("AGENTS_DB_OPTIMIZE_INTERVAL_SEC", 3600))
+    while True:
+        time.sleep(interval)
+        with _writer_lock:
+            if _writer is None:  # closed at exit
+                return
+            try:
+                _writer.execute("PRAGMA optimize;")
+            except sqlite3.Error:
+                pass  # best effort; try again next interval
+
+def _connect_reader() -> sqlite3.Connection:
+    """
+    Open a read-only connection; in WAL mode it never waits on the writer.
+    """
+    return _tune(sqlite3.connect(
+        f"file:{DB_PATH}?mode=ro", uri=True, check_same_thread=False,
+        isolation_level=None, cached_statements=_STATEMENT_CACHE_SIZE,
+    ))
+
+@atexit.register
+def _close_conns() -> None:
+    """
+    Run PRAGMA optimize on the writer, then close it and the exiting (main)
+    thread's reader. Other threads' readers are released with their
+    threading.local storage.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.execute("PRAGMA optimize;")
+        for conn in (_tls.reader, _writer):
+            if conn is not None:
+                conn.close()
+        _tls.reader = _writer = None
+
+@contextmanager
+def get_db():
+    """
+    Context‐manager yielding the process-wide writer sqlite3.Connection
+    (foreign‐keys ON, WAL mode, long busy timeout for concurrent test safety).
+    The outermost block holds the writer lock and opens a BEGIN IMMEDIATE
+    transaction (the write lock is taken up front, never upgraded mid-way),
+    commits on exit and rolls back on exception; nested blocks join it.
+    """
+    global _writer
+    if _tls.depth:
+        _tls.depth += 1
+        try:
+            yield _writer
+        finally:
+            _tls.depth -= 1
+        return
+
+    with _writer_lock:
+        if _writer is None:
+            _writer = _connect_writer()
+        conn = _writer
+        _tls.depth = 1
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+        except:
+            conn.rollback()
+            raise
+        finally:
+            _tls.depth = 0
+            callbacks, _tls.on_exit = _tls.on_exit, []
+            for fn in callbacks:
+                fn()
+
+@contextmanager
+def get_reader():
+    """
+    Context‐manager yielding this thread's read-only connection for pure
+    SELECT helpers. Inside a get_db() block it yields the writer instead,
+    so a thread always sees its own uncommitted writes.
+    """
+    if _tls.depth:
+        yield _writer
+        return
+    conn = _tls.reader
+    if conn is None:
+        conn = _tls.reader = _connect_reader()
+    yield conn
+
+@contextmanager
+def get_reader_tuple():
+    """
+    Like get_reader(), but yields a cursor that returns plain tuples instead
+    of sqlite3.Row, for hot readers that unpack explicit columns while
+    iterating the cursor.
+    """
+    with get_reader() as db:
+        cur = db.cursor()
+        cur.row_factory = None
+        try:
+            yield cur
+        finally:
+            cur.close()
+
+def after_commit(fn: Callable[[], None]) -> None:
+    """
+    Run fn once this thread's outermost get_db() block has committed (or
+    rolled back); immediately if no block is open.
+    """
+    if _tls.depth:
+        _tls.on_exit.append(fn)
+    else:
+        fn()
+
+class ReadCache:
+    """
+    Process-local cache for rows of tables that are only written through
+    these modules. Entries are grouped by scope (e.g. the conversation key)
+    so a writer can drop one entry or a whole scope via invalidate().
+
+    Invalidation runs after the writer's transaction ends, and bumps a
+    generation counter so a read that overlapped the write cannot store
+    its stale result. Inside a get_db() block the cache is bypassed, since
+    only the writer sees the block's uncommitted changes.
+    """
+    MISS = object()
+
+    def __init__(self, maxsize: int = 4096):
+        self._lock = threading.Lock()
+        self._scopes: Dict[Hashable, Dict[Hashable, Any]] = {}
+        self._gen = 0
+        self._maxsize = maxsize  # scopes kept before the cache is flushed
+
+    def get(self, scope: Hashable, key: Hashable = None) -> Any:
+        if _tls.depth:
+            return self.MISS
+        with self._lock:
+            return self._scopes.get(scope, {}).get(key, self.MISS)
+
+    def generation(self) -> int:
+        """Take before reading; pass to put() with the result."""
+        return self._gen
+
+    def put(self, scope: Hashable, key: Hashable, value: Any, gen: int) -> None:
+        if _tls.depth:
+            return
+        with self._lock:
+            if gen != self._gen:
+                return
+            if scope not in self._scopes and len(self._scopes) >= self._maxsize:
+                self._scopes.clear()
+            self._scopes.setdefault(scope, {})[key] = value
+
+    def invalidate(self, scope: Hashable, key: Hashable = MISS) -> None:
+        """
+        Drop one entry, or the whole scope when key is omitted, once the
+        current transaction ends.
+        """
+        def drop():
+            with self._lock:
+                self._gen += 1
+                if key is self.MISS:
+                    self._scopes.pop(scope, None)
+                else:
+                    self._scopes.get(scope, {}).pop(key, None)
+        after_commit(drop)
 
 def init_db():
     """
@@ -49,8 +290,12 @@ def init_db():
       • agent_state
       • agent_call_stack  ← now with parent_role, parent_id
       • conversation_metadata 
+    Skipped entirely when PRAGMA user_version says the schema is current.
     """
     with get_db() as db:
+        if db.execute("PRAGMA user_version;").fetchone()[0] >= SCHEMA_VERSION:
+            return
+
         # 1) agents_running
         db.execute("""
         CREATE TABLE IF NOT EXISTS agents_running (
@@ -61,6 +306,18 @@ def init_db():
             created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
         """)
+        # Migration: tables that predate per-repo scoping lack repo_url
+        cols = [r["name"] for r in db.execute("PRAGMA table_info(agents_running);").fetchall()]
+        if "repo_url" not in cols:
+            db.execute("ALTER TABLE agents_running ADD COLUMN repo_url TEXT NOT NULL DEFAULT '';")
+        ensure_agents_running_key(db)
+        # per-role lookups in insertion order (generate_agent_id) without a
+        # temp sort; turns, messages and agent_call_stack are already served
+        # by their primary keys (tool_meta filters get their own, below)
+        db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_agents_running_repo_role
+            ON agents_running (repo_url, agent_role, id);
+        """)
 
         # 2) agents_current
         db.execute("""
@@ -71,6 +328,9 @@ def init_db():
             repo_url    TEXT    NOT NULL
         );
         """)
+        cols = [r["name"] for r in db.execute("PRAGMA table_info(agents_current);").fetchall()]
+        if "repo_url" not in cols:
+            db.execute("ALTER TABLE agents_current ADD COLUMN repo_url TEXT NOT NULL DEFAULT '';")
 
         # 3) turns (now including invocation_reason and turns_to_purge)
         db.execute("""
@@ -118,6 +378,21 @@ def init_db():
         );
         """)
 
+        # query_turns filters on one of these per conversation; each index
+        # ends in turn_idx so the filtered turn keys come straight from it
+        db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tool_meta_status
+            ON tool_meta (repo_url, agent_role, agent_id, status, turn_idx);
+        """)
+        db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tool_meta_tool_name
+            ON tool_meta (repo_url, agent_role, agent_id, tool_name, turn_idx);
+        """)
+        db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tool_meta_deleted
+            ON tool_meta (repo_url, agent_role, agent_id, deleted, turn_idx);
+        """)
+
         # 5) messages
         db.execute("""
         CREATE TABLE IF NOT EXISTS messages (
@@ -164,6 +439,12 @@ def init_db():
             PRIMARY KEY(repo_url,stack_idx)
         );
         """)
+        # Migration: add the parent pointers to stacks created without them
+        cols = [r["name"] for r in db.execute("PRAGMA table_info(agent_call_stack);").fetchall()]
+        if "parent_role" not in cols:
+            db.execute("ALTER TABLE agent_call_stack ADD COLUMN parent_role TEXT;")
+        if "parent_id" not in cols:
+            db.execute("ALTER TABLE agent_call_stack ADD COLUMN parent_id TEXT;")
 
         # 8) conversation_metadata
         db.execute("""
@@ -176,5 +457,12 @@ def init_db():
         );
         """)
 
-# ensure the schema exists (and migrations run) at import time
+        # give the planner statistics for the indexes added above (bounded
+        # by analysis_limit, and only on a schema upgrade)
+        db.execute("ANALYZE;")
+
+        db.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+
+# ensure the directory and schema exist (and migrations run) at import time
+ensure_db_dir()
 init_db()
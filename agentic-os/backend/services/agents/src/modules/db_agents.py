@@ -8,66 +8,9 @@ and a persistent call‐stack (with explicit parent links), all scoped by (repo_
 import sqlite3
 from typing import List, Optional, Tuple, Dict
 
-from modules.db import get_db
-
-
-def initialize_agents_db():
-    """
-    Create or migrate the agents_running, agents_current, and agent_call_stack tables.
-    (No in-place ALTER for parent columns—you must start with a fresh DB or manage migration separately.)
-    """
-    with get_db() as db:
-        # 1) agents_running
-        cols = db.execute("PRAGMA table_info(agents_running)").fetchall()
-        if not cols:
-            db.execute("""
-            CREATE TABLE agents_running (
-                id           INTEGER PRIMARY KEY AUTOINCREMENT,
-                agent_role   TEXT    NOT NULL,
-                agent_id     TEXT    NOT NULL,
-                repo_url     TEXT    NOT NULL,
-                created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-            """)
-        else:
-            names = [c["name"] for c in cols]
-            if "repo_url" not in names:
-                db.execute("ALTER TABLE agents_running ADD COLUMN repo_url TEXT NOT NULL DEFAULT '';")
-
-        # 2) agents_current
-        cols2 = db.execute("PRAGMA table_info(agents_current)").fetchall()
-        if not cols2:
-            db.execute("""
-            CREATE TABLE agents_current (
-                id          INTEGER PRIMARY KEY CHECK (id = 1),
-                agent_role  TEXT    NOT NULL,
-                agent_id    TEXT    NOT NULL,
-                repo_url    TEXT    NOT NULL
-            );
-            """)
-        else:
-            names2 = [c["name"] for c in cols2]
-            if "repo_url" not in names2:
-                db.execute("ALTER TABLE agents_current ADD COLUMN repo_url TEXT NOT NULL DEFAULT '';")
-
-        # 3) agent_call_stack (now with explicit parent pointers)
-        cols3 = db.execute("PRAGMA table_info(agent_call_stack)").fetchall()
-        if not cols3:
-            db.execute("""
-            CREATE TABLE agent_call_stack (
-                repo_url    TEXT    NOT NULL,
-                stack_idx   INTEGER NOT NULL,
-                agent_role  TEXT    NOT NULL,
-                agent_id    TEXT    NOT NULL,
-                parent_role TEXT,               -- new
-                parent_id   TEXT,               -- new
-                pushed_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY(repo_url,stack_idx)
-            );
-            """)
-
-# Run migrations (or creations) at import time
-initialize_agents_db()
+from modules.db import (
+    get_db, get_reader, get_reader_tuple, HAS_RETURNING,
+)
 
 
 def generate_agent_id(
@@ -77,15 +20,17 @@ def generate_agent_id(
     """
     Return the next numeric agent_id (zero‐padded) for this role+repo.
     """
-    with get_db() as db:
-        rows = db.execute(
-            "SELECT agent_id FROM agents_running "
-            "WHERE agent_role=? AND repo_url=? ORDER BY id",
+    with get_reader_tuple() as cur:
+        # all-digit ids only (non-empty, no non-digit character)
+        (next_id,) = cur.execute(
+            """
+            SELECT COALESCE(MAX(CAST(agent_id AS INTEGER)), 0) + 1
+              FROM agents_running
+             WHERE agent_role=? AND repo_url=?
+               AND agent_id <> '' AND agent_id NOT GLOB '*[^0-9]*'
+            """,
             (agent_role, repo_url)
-        ).fetchall()
-
-    existing = [int(r["agent_id"]) for r in rows if r["agent_id"].isdigit()]
-    next_id = max(existing) + 1 if existing else 1
+        ).fetchone()
     return f"{next_id:03d}"
 
 
@@ -95,12 +40,81 @@ def list_running_agents(
     """
     Return all running agents for the given repo_url.
     """
-    with get_db() as db:
-        rows = db.execute(
-            "SELECT * FROM agents_running WHERE repo_url=? ORDER BY created_at",
+    with get_reader_tuple() as cur:
+        cur.execute(
+            "SELECT id, agent_role, agent_id, repo_url, created_at "
+            "FROM agents_running WHERE repo_url=? ORDER BY created_at",
             (repo_url,)
-        ).fetchall()
-    return [dict(r) for r in rows]
+        )
+        return [
+            {"id": rid, "agent_role": role, "agent_id": aid,
+             "repo_url": repo, "created_at": created}
+            for rid, role, aid, repo, created in cur
+        ]
+
+
+def get_running_agent(
+    agent_role: str,
+    agent_id:   str,
+    repo_url:   str
+) -> Optional[Dict]:
+    """
+    Return the running-agent row for (agent_role, agent_id, repo_url), or None.
+    """
+    with get_reader() as db:
+        row = db.execute(
+            "SELECT * FROM agents_running "
+            "WHERE agent_role=? AND agent_id=? AND repo_url=? "
+            "ORDER BY created_at LIMIT 1",
+            (agent_role, agent_id, repo_url)
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def running_agent_exists(
+    agent_role: str,
+    agent_id:   str,
+    repo_url:   str
+) -> bool:
+    """
+    Return True if a running-agent row exists for (agent_role, agent_id, repo_url).
+    """
+    with get_reader() as db:
+        row = db.execute(
+            "SELECT 1 FROM agents_running "
+            "WHERE agent_role=? AND agent_id=? AND repo_url=? LIMIT 1",
+            (agent_role, agent_id, repo_url)
+        ).fetchone()
+    return row is not None
+
+
+_INSERT_RUNNING_AGENT_STRICT = (
+    "INSERT INTO agents_running (agent_role,agent_id,repo_url) VALUES (?,?,?)"
+)
+_INSERT_RUNNING_AGENT = (
+    _INSERT_RUNNING_AGENT_STRICT +
+    " ON CONFLICT(repo_url,agent_role,agent_id) DO NOTHING"
+)
+_RUNNING_AGENT_RETURNING = " RETURNING id,agent_role,agent_id,repo_url,created_at"
+# DO NOTHING returns no row on conflict; callers then read the existing one
+_INSERT_RUNNING_AGENT_RETURNING = _INSERT_RUNNING_AGENT + _RUNNING_AGENT_RETURNING
+_INSERT_RUNNING_AGENT_STRICT_RETURNING = (
+    _INSERT_RUNNING_AGENT_STRICT + _RUNNING_AGENT_RETURNING
+)
+
+
+def upsert_running_agent(
+    agent_role: str,
+    repo_url:   str,
+    agent_id:   str,
+) -> bool:
+    """
+    Insert the running-agent row if it is missing, in one statement.
+    Returns True if a row was inserted, False if it already existed.
+    """
+    with get_db() as db:
+        cur = db.execute(_INSERT_RUNNING_AGENT, (agent_role, agent_id, repo_url))
+    return cur.rowcount > 0
 
 
 def add_running_agent(
@@ -110,21 +124,34 @@ def add_running_agent(
 ) -> Dict:
     """
     Create and return a new running-agent row.
-    If agent_id is provided, INSERT with that ID;
-    otherwise auto-generate a fresh numeric ID.
+    If agent_id is provided, INSERT with that ID (returning the existing
+    row if it is already there); otherwise auto-generate a fresh numeric ID.
+    The ID is generated under the same writer transaction as the INSERT, so
+    concurrent callers can't both pick it.
     """
-    aid = agent_id if agent_id is not None else generate_agent_id(agent_role, repo_url)
-
     with get_db() as db:
-        db.execute(
-            "INSERT INTO agents_running (agent_role,agent_id,repo_url) VALUES (?,?,?)",
-            (agent_role, aid, repo_url)
-        )
-        row = db.execute(
-            "SELECT * FROM agents_running "
-            "WHERE agent_role=? AND agent_id=? AND repo_url=?",
-            (agent_role, aid, repo_url)
-        ).fetchone()
+        if agent_id is None:
+            aid = generate_agent_id(agent_role, repo_url)
+            insert, insert_returning = (
+                _INSERT_RUNNING_AGENT_STRICT, _INSERT_RUNNING_AGENT_STRICT_RETURNING
+            )
+        else:
+            aid = agent_id
+            insert, insert_returning = (
+                _INSERT_RUNNING_AGENT, _INSERT_RUNNING_AGENT_RETURNING
+            )
+
+        if HAS_RETURNING:
+            row = db.execute(insert_returning, (agent_role, aid, repo_url)).fetchone()
+        else:
+            db.execute(insert, (agent_role, aid, repo_url))
+            row = None
+        if row is None:
+            row = db.execute(
+                "SELECT * FROM agents_running "
+                "WHERE agent_role=? AND agent_id=? AND repo_url=?",
+                (agent_role, aid, repo_url)
+            ).fetchone()
 
     return dict(row)
 
@@ -161,13 +188,10 @@ def load_current_agent_pointer() -> Optional[Tuple[str,str,str]]:
     """
     Fetch the singleton current-agent pointer as (agent_role,agent_id,repo_url), or None.
     """
-    with get_db() as db:
-        row = db.execute(
+    with get_reader_tuple() as cur:
+        return cur.execute(
             "SELECT agent_role, agent_id, repo_url FROM agents_current WHERE id=1"
         ).fetchone()
-    if row:
-        return (row["agent_role"], row["agent_id"], row["repo_url"])
-    return None
 
 
 def save_current_agent_pointer(
@@ -208,34 +232,27 @@ def push_call_stack(
     recording an explicit parent_role/parent_id.
     """
     with get_db() as db:
-        # find current top index
-        mx_row = db.execute(
-            "SELECT MAX(stack_idx) AS mx FROM agent_call_stack WHERE repo_url=?",
-            (repo_url,)
-        ).fetchone()
-        mx = mx_row["mx"]
-        next_idx = (mx + 1) if mx is not None else 0
-
-        # look up parent if present
-        if mx is not None:
-            top = db.execute(
-                "SELECT agent_role, agent_id FROM agent_call_stack "
-                "WHERE repo_url=? AND stack_idx=?",
-                (repo_url, mx)
-            ).fetchone()
-            parent_role, parent_id = top["agent_role"], top["agent_id"]
-        else:
-            parent_role = None
-            parent_id   = None
-
-        # insert with parent pointers
+        # one statement: next index and parent pointers come from the
+        # current top row (if any) of this repo's stack
         db.execute(
             """
+            WITH top AS (
+              SELECT stack_idx, agent_role, agent_id
+                FROM agent_call_stack
+               WHERE repo_url = :repo
+               ORDER BY stack_idx DESC
+               LIMIT 1
+            )
             INSERT INTO agent_call_stack
               (repo_url, stack_idx, agent_role, agent_id, parent_role, parent_id)
-            VALUES (?, ?, ?, ?, ?, ?)
+            SELECT :repo,
+                   COALESCE((SELECT stack_idx FROM top) + 1, 0),
+                   :role,
+                   :aid,
+                   (SELECT agent_role FROM top),
+                   (SELECT agent_id   FROM top)
             """,
-            (repo_url, next_idx, agent_role, agent_id, parent_role, parent_id)
+            {"repo": repo_url, "role": agent_role, "aid": agent_id}
         )
 
 
@@ -247,6 +264,19 @@ def pop_call_stack(
     or None if the stack was empty.
     """
     with get_db() as db:
+        if HAS_RETURNING:
+            top = db.execute(
+                """
+                DELETE FROM agent_call_stack
+                 WHERE repo_url=:repo
+                   AND stack_idx=(SELECT MAX(stack_idx) FROM agent_call_stack
+                                   WHERE repo_url=:repo)
+                RETURNING agent_role, agent_id
+                """,
+                {"repo": repo_url}
+            ).fetchone()
+            return (top["agent_role"], top["agent_id"]) if top else None
+
         row = db.execute(
             "SELECT MAX(stack_idx) AS mx FROM agent_call_stack WHERE repo_url=?",
             (repo_url,)
@@ -277,8 +307,8 @@ def load_call_stack(
     from bottom (0) to top, returning tuples of
       (agent_role, agent_id, parent_role, parent_id).
     """
-    with get_db() as db:
-        rows = db.execute(
+    with get_reader_tuple() as cur:
+        cur.execute(
             """
             SELECT agent_role, agent_id, parent_role, parent_id
               FROM agent_call_stack
@@ -286,9 +316,5 @@ def load_call_stack(
              ORDER BY stack_idx
             """,
             (repo_url,)
-        ).fetchall()
-
-    return [
-        (r["agent_role"], r["agent_id"], r["parent_role"], r["parent_id"])
-        for r in rows
-    ]
+        )
+        return list(cur)
@@ -1,7 +1,8 @@
 # modules/db_messages.py
 
 import json
-from modules.db import get_db
+from typing import Dict, Iterable, Optional
+from modules.db import get_db, get_reader
 from modules.db_state import allocate_next_message_id
 
 def save_messages(
@@ -63,7 +64,19 @@ def save_messages(
                   json.dumps(raw_data) if raw_data else None
                 )
             )
-        db.commit()
+
+
+def _add_message(out: dict, r) -> None:
+    """Add one messages row to a role→{ raw:…, meta:… } mapping."""
+    raw = json.loads(r["raw_json"]) if r["raw_json"] else {}
+    raw["role"]    = r["role"]
+    raw["content"] = r["content"]
+    meta = {
+        "timestamp":           r["timestamp"],
+        "original_message_id": r["original_message_id"],
+        "char_count":          r["char_count"]
+    }
+    out[r["role"]] = {"raw": raw, "meta": meta}
 
 
 def load_messages(
@@ -76,7 +89,7 @@ def load_messages(
     Returns messages mapping role→{ raw:…, meta:… }.
     Scoped by (repo_url, agent_role, agent_id).
     """
-    with get_db() as db:
+    with get_reader() as db:
         rows = db.execute(
             """
             SELECT *
@@ -90,15 +103,50 @@ def load_messages(
 
     out = {}
     for r in rows:
-        raw = json.loads(r["raw_json"]) if r["raw_json"] else {}
-        raw["role"]    = r["role"]
-        raw["content"] = r["content"]
-        meta = {
-            "timestamp":           r["timestamp"],
-            "original_message_id": r["original_message_id"],
-            "char_count":          r["char_count"]
-        }
-        out[r["role"]] = {"raw": raw, "meta": meta}
+        _add_message(out, r)
+    return out
+
+
+# turn_idx values bound per IN (...) list; stays under the 999-variable
+# limit of SQLite builds before 3.32
+_IN_CHUNK = 900
+
+
+def load_messages_bulk(
+    repo_url: str,
+    agent_role: str,
+    agent_id: str,
+    turn_indices: Optional[Iterable[int]] = None
+) -> Dict[int, dict]:
+    """
+    Load the messages of many turns at once: turn_idx → (role→{ raw:…, meta:… }).
+    Turns without messages are left out. turn_indices=None loads the whole
+    conversation in a single query, otherwise IN (...) lists are used.
+    Scoped by (repo_url, agent_role, agent_id).
+    """
+    sql = (
+        "SELECT * FROM messages "
+        "WHERE repo_url=? AND agent_role=? AND agent_id=?{} "
+        "ORDER BY turn_idx, message_idx"
+    )
+    scope = (repo_url, agent_role, agent_id)
+    if turn_indices is None:
+        batches = [(sql.format(""), scope)]
+    else:
+        idx = list(turn_indices)
+        batches = []
+        for i in range(0, len(idx), _IN_CHUNK):
+            chunk = idx[i:i + _IN_CHUNK]
+            in_list = ",".join("?" * len(chunk))
+            batches.append(
+                (sql.format(f" AND turn_idx IN ({in_list})"), scope + tuple(chunk))
+            )
+
+    out: Dict[int, dict] = {}
+    with get_reader() as db:
+        for q, params in batches:
+            for r in db.execute(q, params):
+                _add_message(out.setdefault(r["turn_idx"], {}), r)
     return out
 
 
@@ -121,4 +169,3 @@ def delete_messages(
             """,
             (repo_url, agent_role, agent_id, turn_idx)
         )
-        db.commit()
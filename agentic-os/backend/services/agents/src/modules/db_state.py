@@ -8,7 +8,48 @@ State is scoped to (repo_url, agent_role, agent_id).
 """
 
 from typing import Tuple, Optional
-from modules.db import get_db
+from modules.db import get_db, get_reader, HAS_RETURNING, ReadCache
+
+# load_state() results keyed by (repo_url, agent_role, agent_id); every
+# writer below invalidates its key.
+_state_cache = ReadCache()
+
+# Hot statements live at module level so each connection's statement cache
+# is keyed by the same string object on every call.
+_BUMP_TURN_IDX = """
+INSERT INTO agent_state
+  (repo_url, agent_role, agent_id, last_turn_idx, last_message_id)
+VALUES (?, ?, ?, 0, -1)
+ON CONFLICT(repo_url, agent_role, agent_id) DO UPDATE
+  SET last_turn_idx = last_turn_idx + 1
+RETURNING last_turn_idx
+"""
+
+_BUMP_MESSAGE_ID = """
+INSERT INTO agent_state
+  (repo_url, agent_role, agent_id, last_turn_idx, last_message_id)
+VALUES (?, ?, ?, -1, 0)
+ON CONFLICT(repo_url, agent_role, agent_id) DO UPDATE
+  SET last_message_id = last_message_id + 1
+RETURNING last_message_id
+"""
+
+_SELECT_STATE = (
+    "SELECT last_turn_idx, last_message_id FROM agent_state "
+    "WHERE repo_url=? AND agent_role=? AND agent_id=?"
+)
+
+# A NULL counter keeps the stored value (or -1 for a new row). The update
+# reads ?4/?5 rather than excluded.*, which already has the -1 folded in.
+_UPSERT_STATE = """
+INSERT INTO agent_state
+  (repo_url, agent_role, agent_id, last_turn_idx, last_message_id)
+VALUES (?1, ?2, ?3, COALESCE(?4, -1), COALESCE(?5, -1))
+ON CONFLICT(repo_url, agent_role, agent_id)
+DO UPDATE SET
+  last_turn_idx    = COALESCE(?4, last_turn_idx),
+  last_message_id  = COALESCE(?5, last_message_id)
+"""
 
 
 def allocate_next_turn_idx(
@@ -22,6 +63,13 @@ def allocate_next_turn_idx(
     Scoped by (repo_url, agent_role, agent_id).
     """
     with get_db() as db:
+        _state_cache.invalidate((repo_url, agent_role, agent_id))
+        if HAS_RETURNING:
+            # insert at 0 or bump in place, reading the result back in one go
+            return db.execute(
+                _BUMP_TURN_IDX, (repo_url, agent_role, agent_id)
+            ).fetchone()[0]
+
         # fetch existing state (if any)
         row = db.execute(
             "SELECT last_turn_idx FROM agent_state "
@@ -72,6 +120,12 @@ def allocate_next_message_id(
     Scoped by (repo_url, agent_role, agent_id).
     """
     with get_db() as db:
+        _state_cache.invalidate((repo_url, agent_role, agent_id))
+        if HAS_RETURNING:
+            return db.execute(
+                _BUMP_MESSAGE_ID, (repo_url, agent_role, agent_id)
+            ).fetchone()[0]
+
         # fetch existing state (if any)
         row = db.execute(
             "SELECT last_message_id, last_turn_idx FROM agent_state "
@@ -107,15 +161,17 @@ def load_state(
     or (-1, -1) if no state row exists yet.
     Scoped by (repo_url, agent_role, agent_id).
     """
-    with get_db() as db:
-        row = db.execute(
-            "SELECT last_turn_idx, last_message_id FROM agent_state "
-            "WHERE repo_url=? AND agent_role=? AND agent_id=?",
-            (repo_url, agent_role, agent_id)
-        ).fetchone()
-    if not row:
-        return -1, -1
-    return row["last_turn_idx"], row["last_message_id"]
+    scope = (repo_url, agent_role, agent_id)
+    state = _state_cache.get(scope)
+    if state is not ReadCache.MISS:
+        return state
+
+    gen = _state_cache.generation()
+    with get_reader() as db:
+        row = db.execute(_SELECT_STATE, scope).fetchone()
+    state = (row["last_turn_idx"], row["last_message_id"]) if row else (-1, -1)
+    _state_cache.put(scope, None, state, gen)
+    return state
 
 
 def save_state(
@@ -131,23 +187,11 @@ def save_state(
     value for that column.
     Scoped by (repo_url, agent_role, agent_id).
     """
-    # first read the existing
-    cur_turn, cur_msg = load_state(repo_url, agent_role, agent_id)
-    nt = last_turn_idx    if last_turn_idx    is not None else cur_turn
-    nm = last_message_id  if last_message_id  is not None else cur_msg
-
     with get_db() as db:
+        _state_cache.invalidate((repo_url, agent_role, agent_id))
         db.execute(
-            """
-            INSERT INTO agent_state
-              (repo_url, agent_role, agent_id, last_turn_idx, last_message_id)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(repo_url, agent_role, agent_id)
-            DO UPDATE SET
-              last_turn_idx    = excluded.last_turn_idx,
-              last_message_id  = excluded.last_message_id
-            """,
-            (repo_url, agent_role, agent_id, nt, nm)
+            _UPSERT_STATE,
+            (repo_url, agent_role, agent_id, last_turn_idx, last_message_id)
         )
 
 
@@ -162,6 +206,7 @@ def delete_state(
     Scoped by (repo_url, agent_role, agent_id).
     """
     with get_db() as db:
+        _state_cache.invalidate((repo_url, agent_role, agent_id))
         db.execute(
             "DELETE FROM agent_state "
             "WHERE repo_url=? AND agent_role=? AND agent_id=?",
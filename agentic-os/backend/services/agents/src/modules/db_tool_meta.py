@@ -1,8 +1,144 @@
 # modules/db_tool_meta.py
 
-import json
+import zlib
 from contextlib import closing
-from modules.db import get_db
+from typing import Dict, Iterable, List, Optional, Tuple
+from modules.db import get_db, get_reader, ReadCache
+from modules.json_codec import encode as _encode, dumps as _dumps, loads as _loads
+
+# Argument payloads at least this large are stored as a level-1 zlib BLOB
+# instead of JSON text; smaller ones don't shrink enough to be worth it.
+_COMPRESS_MIN_BYTES = 512
+
+def _pack(obj):
+    """
+    Serialize a tool-args dict for normalized_args_json / input_args_json:
+    JSON text when small, zlib-compressed JSON bytes (a BLOB) when large.
+    """
+    raw = _encode(obj)
+    if len(raw) < _COMPRESS_MIN_BYTES:
+        return raw.decode()
+    return zlib.compress(raw, 1)
+
+def _unpack(value, default: str):
+    """Inverse of _pack; also reads plain JSON text written before it."""
+    if isinstance(value, bytes):
+        return _loads(zlib.decompress(value))
+    return _loads(value or default)
+
+# Raw tool_meta rows (None when absent), scoped by conversation and keyed
+# by turn_idx; decoded afresh on every load since callers mutate the dict.
+_row_cache = ReadCache()
+
+def invalidate_tool_meta_cache(repo_url: str, agent_role: str, agent_id: str):
+    """
+    Forget cached tool_meta for a conversation; for writers that remove
+    rows indirectly (e.g. deleting turns cascades into tool_meta).
+    """
+    _row_cache.invalidate((repo_url, agent_role, agent_id))
+
+# Module-level SQL: one string object per statement keeps the per-connection
+# statement cache hitting on every call.
+_UPSERT_TOOL_META = """
+INSERT INTO tool_meta (
+  repo_url,
+  agent_role,
+  agent_id,
+  turn_idx,
+  tool_name,
+  execution_time,
+  pending_deletion,
+  deleted,
+  rejection,
+  status,
+  args_hash,
+  preservation_policy,
+  normalized_args_json,
+  normalized_filename,
+  input_args_json
+) VALUES (
+  ?,?,?,?,?,?,?,?,?,?,?,?,?,?,?
+)
+ON CONFLICT(repo_url,agent_role,agent_id,turn_idx) DO UPDATE SET
+  tool_name            = excluded.tool_name,
+  execution_time       = excluded.execution_time,
+  pending_deletion     = excluded.pending_deletion,
+  deleted              = excluded.deleted,
+  rejection            = excluded.rejection,
+  status               = excluded.status,
+  args_hash            = excluded.args_hash,
+  preservation_policy  = excluded.preservation_policy,
+  normalized_args_json = excluded.normalized_args_json,
+  normalized_filename  = excluded.normalized_filename,
+  input_args_json      = excluded.input_args_json
+"""
+
+_SELECT_TOOL_META = """
+SELECT *
+  FROM tool_meta
+ WHERE repo_url=? AND agent_role=? AND agent_id=? AND turn_idx=?
+"""
+
+_SELECT_TOOL_META_SCOPE = """
+SELECT *
+  FROM tool_meta
+ WHERE repo_url=? AND agent_role=? AND agent_id=?
+"""
+
+# turn_idx values bound per IN (...) list; stays under the 999-variable
+# limit of SQLite builds before 3.32
+_IN_CHUNK = 900
+
+_DELETE_TOOL_META = """
+DELETE
+  FROM tool_meta
+ WHERE repo_url=? AND agent_role=? AND agent_id=? AND turn_idx=?
+"""
+
+def _tool_meta_params(
+    repo_url: str,
+    agent_role: str,
+    agent_id: str,
+    turn_idx: int,
+    tm: dict
+) -> tuple:
+    """
+    Build the _UPSERT_TOOL_META parameters for one row, serializing the
+    structured fields (args, rejection, filenames) to JSON. A missing
+    rejection or filename list is bound as SQL NULL rather than "null".
+    """
+    rejection           = tm.get("rejection")
+    normalized_filename = tm.get("normalized_filename")
+    return (
+        repo_url,
+        agent_role,
+        agent_id,
+        turn_idx,
+        tm.get("tool_name"),
+        tm.get("execution_time", 0.0),
+        int(bool(tm.get("pending_deletion"))),
+        int(bool(tm.get("deleted"))),
+        None if rejection is None else _dumps(rejection),
+        tm.get("status"),
+        tm.get("args_hash"),
+        tm.get("preservation_policy"),
+        _pack(tm.get("normalized_args", {})),
+        None if normalized_filename is None else _dumps(normalized_filename),
+        _pack(tm.get("input_args", {})),
+    )
+
+def save_tool_meta_bulk(rows: List[Tuple[str, str, str, int, dict]]):
+    """
+    Upsert many tool_meta rows, each given as
+    (repo_url, agent_role, agent_id, turn_idx, tm), with one executemany
+    inside a single transaction.
+    """
+    if not rows:
+        return
+    with get_db() as db:
+        for repo_url, agent_role, agent_id, turn_idx, _ in rows:
+            _row_cache.invalidate((repo_url, agent_role, agent_id), turn_idx)
+        db.executemany(_UPSERT_TOOL_META, (_tool_meta_params(*r) for r in rows))
 
 def save_tool_meta(
     repo_url: str,
@@ -18,62 +154,29 @@ def save_tool_meta(
 
     Scoped by (repo_url, agent_role, agent_id).
     """
-    normalized_args_json     = json.dumps(tm.get("normalized_args", {}))
-    input_args_json          = json.dumps(tm.get("input_args", {}))
-    rejection_json           = json.dumps(tm.get("rejection", None))
-    normalized_filename_json = json.dumps(tm.get("normalized_filename", []))
+    save_tool_meta_bulk([(repo_url, agent_role, agent_id, turn_idx, tm)])
 
-    with get_db() as db:
-        db.execute("""
-          INSERT INTO tool_meta (
-            repo_url,
-            agent_role,
-            agent_id,
-            turn_idx,
-            tool_name,
-            execution_time,
-            pending_deletion,
-            deleted,
-            rejection,
-            status,
-            args_hash,
-            preservation_policy,
-            normalized_args_json,
-            normalized_filename,
-            input_args_json
-          ) VALUES (
-            ?,?,?,?,?,?,?,?,?,?,?,?,?,?,?
-          )
-          ON CONFLICT(repo_url,agent_role,agent_id,turn_idx) DO UPDATE SET
-            tool_name            = excluded.tool_name,
-            execution_time       = excluded.execution_time,
-            pending_deletion     = excluded.pending_deletion,
-            deleted              = excluded.deleted,
-            rejection            = excluded.rejection,
-            status               = excluded.status,
-            args_hash            = excluded.args_hash,
-            preservation_policy  = excluded.preservation_policy,
-            normalized_args_json = excluded.normalized_args_json,
-            normalized_filename  = excluded.normalized_filename,
-            input_args_json      = excluded.input_args_json
-        """, (
-            repo_url,
-            agent_role,
-            agent_id,
-            turn_idx,
-            tm.get("tool_name"),
-            tm.get("execution_time", 0.0),
-            int(bool(tm.get("pending_deletion"))),
-            int(bool(tm.get("deleted"))),
-            rejection_json,
-            tm.get("status"),
-            tm.get("args_hash"),
-            tm.get("preservation_policy"),
-            normalized_args_json,
-            normalized_filename_json,
-            input_args_json,
-        ))
-        db.commit()
+def _decode_row(row) -> dict:
+    """
+    Turn a tool_meta row into a dict suitable for UnifiedTurn.tool_meta,
+    parsing the JSON columns back into Python objects ({} for no row).
+    """
+    if not row:
+        return {}
+
+    return {
+        "tool_name":           row["tool_name"],
+        "execution_time":      row["execution_time"],
+        "pending_deletion":    bool(row["pending_deletion"]),
+        "deleted":             bool(row["deleted"]),
+        "rejection":           _loads(row["rejection"]) if row["rejection"] is not None else None,
+        "status":              row["status"],
+        "args_hash":           row["args_hash"],
+        "preservation_policy": row["preservation_policy"],
+        "normalized_args":     _unpack(row["normalized_args_json"], "{}"),
+        "normalized_filename": _loads(row["normalized_filename"] or "[]"),
+        "input_args":          _unpack(row["input_args_json"], "{}"),
+    }
 
 def load_tool_meta(
     repo_url: str,
@@ -87,29 +190,55 @@ def load_tool_meta(
 
     Scoped by (repo_url, agent_role, agent_id).
     """
-    with get_db() as db:
-        row = db.execute("""
-          SELECT *
-            FROM tool_meta
-           WHERE repo_url=? AND agent_role=? AND agent_id=? AND turn_idx=?
-        """, (repo_url, agent_role, agent_id, turn_idx)).fetchone()
-
-        if not row:
-            return {}
-
-        return {
-            "tool_name":           row["tool_name"],
-            "execution_time":      row["execution_time"],
-            "pending_deletion":    bool(row["pending_deletion"]),
-            "deleted":             bool(row["deleted"]),
-            "rejection":           json.loads(row["rejection"]),
-            "status":              row["status"],
-            "args_hash":           row["args_hash"],
-            "preservation_policy": row["preservation_policy"],
-            "normalized_args":     json.loads(row["normalized_args_json"] or "{}"),
-            "normalized_filename": json.loads(row["normalized_filename"] or "[]"),
-            "input_args":          json.loads(row["input_args_json"] or "{}"),
-        }
+    scope = (repo_url, agent_role, agent_id)
+    row = _row_cache.get(scope, turn_idx)
+    if row is ReadCache.MISS:
+        gen = _row_cache.generation()
+        with get_reader() as db:
+            row = db.execute(_SELECT_TOOL_META, scope + (turn_idx,)).fetchone()
+        _row_cache.put(scope, turn_idx, row, gen)
+
+    return _decode_row(row)
+
+def load_tool_meta_bulk(
+    repo_url: str,
+    agent_role: str,
+    agent_id: str,
+    turn_indices: Optional[Iterable[int]] = None
+) -> Dict[int, dict]:
+    """
+    Load tool_meta for many turns at once, keyed by turn_idx; turns without
+    a row are left out. turn_indices=None loads the whole conversation in a
+    single query, otherwise uncached turns are fetched with IN (...) lists.
+
+    Scoped by (repo_url, agent_role, agent_id).
+    """
+    scope = (repo_url, agent_role, agent_id)
+    rows = {}
+    gen = _row_cache.generation()
+    with get_reader() as db:
+        if turn_indices is None:
+            for row in db.execute(_SELECT_TOOL_META_SCOPE, scope):
+                rows[row["turn_idx"]] = row
+            missing = list(rows)
+        else:
+            missing = []
+            for idx in turn_indices:
+                row = _row_cache.get(scope, idx)
+                if row is ReadCache.MISS:
+                    missing.append(idx)
+                elif row:
+                    rows[idx] = row
+            for i in range(0, len(missing), _IN_CHUNK):
+                chunk = missing[i:i + _IN_CHUNK]
+                sql = (_SELECT_TOOL_META_SCOPE +
+                       f"   AND turn_idx IN ({','.join('?' * len(chunk))})")
+                for row in db.execute(sql, scope + tuple(chunk)):
+                    rows[row["turn_idx"]] = row
+
+    for idx in missing:
+        _row_cache.put(scope, idx, rows.get(idx), gen)
+    return {idx: _decode_row(row) for idx, row in rows.items()}
 
 def delete_tool_meta(
     repo_url: str,
@@ -123,9 +252,5 @@ def delete_tool_meta(
     Scoped by (repo_url, agent_role, agent_id).
     """
     with get_db() as db:
-        db.execute("""
-          DELETE
-            FROM tool_meta
-           WHERE repo_url=? AND agent_role=? AND agent_id=? AND turn_idx=?
-        """, (repo_url, agent_role, agent_id, turn_idx))
-        db.commit()
+        _row_cache.invalidate((repo_url, agent_role, agent_id), turn_idx)
+        db.execute(_DELETE_TOOL_META, (repo_url, agent_role, agent_id, turn_idx))
@@ -8,15 +8,77 @@ plus conversation‐level metadata.  We’ve added two new per‐turn fields:
 """
 
 import json
+import functools
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-from modules.db import get_db
-from modules.db_tool_meta import save_tool_meta, load_tool_meta
-from modules.db_messages import save_messages, load_messages
+from typing import Any, Dict, List, Optional, Tuple
+
+from modules.db import get_db, get_reader
+from modules.db_tool_meta import (
+    save_tool_meta_bulk, load_tool_meta_bulk, invalidate_tool_meta_cache,
+)
+from modules.db_messages import save_messages, load_messages_bulk
+from modules.json_codec import dumps as _dumps, loads as _loads
 from modules.unified_turn import UnifiedTurn
 
 
+@functools.lru_cache(maxsize=1024)
+def _decode_turns_to_purge(text: str) -> Tuple[int, ...]:
+    """
+    Decode a stored turns_to_purge list; memoized on the raw text since the
+    same few values (mostly "[]") repeat across turns. Malformed values
+    decode as empty.
+    """
+    try:
+        value = _loads(text)
+    except json.JSONDecodeError:
+        return ()
+    return tuple(value) if isinstance(value, list) else ()
+
+# Fixed SQL as module constants: the same string object every call keeps
+# the per-connection statement cache hitting.
+_DELETE_TURNS = (
+    "DELETE FROM turns WHERE repo_url=? AND agent_role=? AND agent_id=?"
+)
+
+_UPSERT_TURN = """
+INSERT INTO turns
+  (repo_url, agent_role, agent_id,
+   turn_idx, total_char_count,
+   invocation_reason, turns_to_purge)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(repo_url, agent_role, agent_id, turn_idx)
+DO UPDATE SET
+  total_char_count   = excluded.total_char_count,
+  invocation_reason  = excluded.invocation_reason,
+  turns_to_purge     = excluded.turns_to_purge
+"""
+
+_SELECT_TURNS = """
+SELECT turn_idx,
+       total_char_count,
+       invocation_reason,
+       turns_to_purge
+  FROM turns
+ WHERE repo_url=? AND agent_role=? AND agent_id=?
+ ORDER BY turn_idx
+"""
+
+_UPSERT_CONVERSATION_METADATA = """
+INSERT INTO conversation_metadata
+  (repo_url, agent_role, agent_id, metadata)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(repo_url, agent_role, agent_id)
+DO UPDATE SET metadata = excluded.metadata
+ WHERE metadata IS NOT excluded.metadata
+"""
+
+_SELECT_CONVERSATION_METADATA = """
+SELECT metadata
+  FROM conversation_metadata
+ WHERE repo_url=? AND agent_role=? AND agent_id=?
+"""
+
+
 def save_turns(
     repo_url: str,
     agent_role: str,
@@ -25,57 +87,40 @@ def save_turns(
 ):
     """
     Overwrite all finalized turns for (repo_url,agent_role,agent_id).
-    Each write uses an independent DB connection to avoid lock contention.
+    Everything (turn rows, tool_meta, messages) is written in a single
+    transaction: the nested get_db() blocks in the helpers join this one.
     """
-    # 1) wipe existing turns
-    with get_db() as db:
-        db.execute(
-            "DELETE FROM turns WHERE repo_url=? AND agent_role=? AND agent_id=?",
-            (repo_url, agent_role, agent_id)
-        )
-
-    # 2) insert/update each turn, its tool_meta, and its messages
+    turn_rows = []
+    tool_meta_rows = []
     for turn in turns:
-        td    = turn.turn_meta
-        idx   = td["turn"]
-        total = td.get("total_char_count", 0)
-
-        # new fields
-        invocation_reason = td.get("invocation_reason")
-        turns_to_purge    = td.get("turns_to_purge", [])
-        # JSON-encode the list (safe if it’s already a list of ints)
-        ttp_blob = json.dumps(turns_to_purge)
-
-        # a) upsert the turn row, now including our two new columns
-        with get_db() as db:
-            db.execute(
-                """
-                INSERT INTO turns
-                  (repo_url, agent_role, agent_id,
-                   turn_idx, total_char_count,
-                   invocation_reason, turns_to_purge)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(repo_url, agent_role, agent_id, turn_idx)
-                DO UPDATE SET
-                  total_char_count   = excluded.total_char_count,
-                  invocation_reason  = excluded.invocation_reason,
-                  turns_to_purge     = excluded.turns_to_purge
-                """,
-                (
-                  repo_url,
-                  agent_role,
-                  agent_id,
-                  idx,
-                  total,
-                  invocation_reason,
-                  ttp_blob
-                ),
-            )
+        td  = turn.turn_meta
+        idx = td["turn"]
+        turn_rows.append((
+            repo_url,
+            agent_role,
+            agent_id,
+            idx,
+            td.get("total_char_count", 0),
+            td.get("invocation_reason"),
+            # JSON-encode the list (safe if it’s already a list of ints)
+            _dumps(td.get("turns_to_purge") or []),
+        ))
+        tool_meta_rows.append((repo_url, agent_role, agent_id, idx, turn.tool_meta))
 
-        # b) persist tool_meta
-        save_tool_meta(repo_url, agent_role, agent_id, idx, turn.tool_meta)
-        # c) persist messages
-        save_messages(repo_url, agent_role, agent_id, idx, turn.messages)
+    with get_db() as db:
+        # 1) wipe existing turns (cascades into tool_meta & messages)
+        invalidate_tool_meta_cache(repo_url, agent_role, agent_id)
+        db.execute(_DELETE_TURNS, (repo_url, agent_role, agent_id))
+
+        # 2) upsert every turn row at once
+        db.executemany(_UPSERT_TURN, turn_rows)
+
+        # 3) tool_meta and messages, now that their turns exist
+        save_tool_meta_bulk(tool_meta_rows)
+        for turn in turns:
+            save_messages(
+                repo_url, agent_role, agent_id, turn.turn_meta["turn"], turn.messages
+            )
 
 
 def load_turns(
@@ -87,32 +132,23 @@ def load_turns(
     Load all turns (as UnifiedTurn) for (repo_url,agent_role,agent_id),
     in turn_idx order.
     """
-    with get_db() as db:
+    with get_reader() as db:
         rows = db.execute(
-            """
-            SELECT turn_idx,
-                   total_char_count,
-                   invocation_reason,
-                   turns_to_purge
-              FROM turns
-             WHERE repo_url=? AND agent_role=? AND agent_id=?
-             ORDER BY turn_idx
-            """,
-            (repo_url, agent_role, agent_id),
+            _SELECT_TURNS, (repo_url, agent_role, agent_id)
         ).fetchall()
 
+    # one query each for the conversation's tool_meta and messages
+    tm_map  = load_tool_meta_bulk(repo_url, agent_role, agent_id)
+    msg_map = load_messages_bulk(repo_url, agent_role, agent_id)
+
     result: List[UnifiedTurn] = []
     for r in rows:
         idx                = r["turn_idx"]
         total              = r["total_char_count"]
         invocation_reason  = r["invocation_reason"]
-        # parse the JSON-blob back into a list of ints
-        ttp_list = []
-        if r["turns_to_purge"]:
-            try:
-                ttp_list = json.loads(r["turns_to_purge"])
-            except json.JSONDecodeError:
-                ttp_list = []
+        # parse the JSON-blob back into a (fresh) list of ints
+        ttp = r["turns_to_purge"]
+        ttp_list = list(_decode_turns_to_purge(ttp)) if ttp else []
 
         turn_meta = {
             "turn":              idx,
@@ -121,13 +157,189 @@ def load_turns(
             "invocation_reason": invocation_reason,
             "turns_to_purge":    ttp_list,
         }
-        tm   = load_tool_meta(repo_url, agent_role, agent_id, idx)
-        msgs = load_messages(repo_url, agent_role, agent_id, idx)
+        tm   = tm_map.get(idx, {})
+        msgs = msg_map.get(idx, {})
         result.append(UnifiedTurn(turn_meta, tm, msgs))
 
     return result
 
 
+def _sort_keys(sort: Optional[List[str]]) -> Tuple[Tuple[str, bool], ...]:
+    """
+    Parse query_turns' sort spec ("field" / "-field") into (name, desc)
+    pairs, with turn_idx appended as the tie-breaker so the order is total.
+    """
+    keys = [(f[1:], True) if f.startswith("-") else (f, False) for f in sort or []]
+    if all(name != "turn_idx" for name, _ in keys):
+        keys.append(("turn_idx", False))
+    return tuple(keys)
+
+
+def _sort_col(name: str) -> str:
+    return f"t.{name}" if name in ("turn_idx", "total_char_count") else f"tm.{name}"
+
+
+# sort columns that can never be NULL; every other tool_meta column can
+_NOT_NULL_SORT_COLS = frozenset(
+    {"turn_idx", "total_char_count", "pending_deletion", "deleted"}
+)
+
+
+def _seek_sql(
+    keys: Tuple[Tuple[str, bool], ...],
+    nulls: Tuple[bool, ...],
+) -> Tuple[str, Tuple[str, ...]]:
+    """
+    WHERE fragment selecting the rows strictly after a cursor in the order
+    given by keys, plus the cursor fields to bind for it, in order.
+    nulls[i] says whether the cursor's value for keys[i] is NULL.
+
+    SQLite sorts NULL before every value, so NULLs come first in ASC and
+    last in DESC order. Uniform directions with a NULL-free cursor use a
+    row-value comparison where that is NULL-safe; otherwise it expands to
+    (a > ?) OR (a = ? AND b < ?) ..., with IS [NOT] NULL terms where a
+    cursor value or a column may be NULL.
+    """
+    # (in ASC order a NULL column compares as unknown and is rightly left
+    # out, since NULL rows sort before the non-NULL cursor; not so in DESC)
+    if (not any(nulls) and len({desc for _, desc in keys}) == 1
+            and (not keys[0][1]
+                 or all(name in _NOT_NULL_SORT_COLS for name, _ in keys))):
+        cols = ", ".join(_sort_col(name) for name, _ in keys)
+        marks = ", ".join("?" for _ in keys)
+        op = "<" if keys[0][1] else ">"
+        return f"({cols}) {op} ({marks})", tuple(name for name, _ in keys)
+
+    terms, names = [], []
+    for i, (name, desc) in enumerate(keys):
+        col = _sort_col(name)
+        if nulls[i]:
+            if desc:
+                continue  # nothing sorts after NULL in DESC order
+            after, after_names = f"{col} IS NOT NULL", []
+        elif desc and name not in _NOT_NULL_SORT_COLS:
+            after, after_names = f"({col} < ? OR {col} IS NULL)", [name]
+        else:
+            after, after_names = f"{col} {'<' if desc else '>'} ?", [name]
+
+        conds = []
+        for (n, _), is_null in zip(keys[:i], nulls):
+            if is_null:
+                conds.append(f"{_sort_col(n)} IS NULL")
+            else:
+                conds.append(f"{_sort_col(n)} = ?")
+                names.append(n)
+        conds.append(after)
+        names.extend(after_names)
+        terms.append("(" + " AND ".join(conds) + ")")
+
+    if not terms:
+        return "0", ()
+    return "(" + " OR ".join(terms) + ")", tuple(names)
+
+
+def _cursor_nulls(
+    keys: Tuple[Tuple[str, bool], ...],
+    after: Dict[str, Any]
+) -> Tuple[bool, ...]:
+    """Which of the cursor's sort-key values are NULL (None)."""
+    for name, _ in keys:
+        if name not in after:
+            raise ValueError(f"query_turns: cursor has no value for sort key {name!r}")
+    return tuple(after[name] is None for name, _ in keys)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_query_sql(
+    has_status: bool,
+    has_tool_name: bool,
+    has_deleted: bool,
+    after_nulls: Optional[Tuple[bool, ...]],
+    keys: Tuple[Tuple[str, bool], ...],
+) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Build query_turns' SQL for one filter/sort combination. The text only
+    depends on which filters are set (and, with a cursor, which of its
+    values are NULL), so it is built once per combination and every call
+    binds its values positionally, in this order:
+      scope, status, tool_name, deleted, cursor, limit, offset, scope.
+    Also returns the cursor fields to bind, in order (empty without one).
+    """
+    clauses = [
+        "t.repo_url = ?",
+        "t.agent_role = ?",
+        "t.agent_id = ?",
+    ]
+    if has_status:
+        clauses.append("tm.status = ?")
+    if has_tool_name:
+        clauses.append("tm.tool_name = ?")
+    if has_deleted:
+        clauses.append("tm.deleted = ?")
+    seek_names: Tuple[str, ...] = ()
+    if after_nulls is not None:
+        seek, seek_names = _seek_sql(keys, after_nulls)
+        clauses.append(seek)
+
+    where_sql = " AND ".join(clauses)
+
+    # Build ORDER BY; the page subquery also exposes the sort keys as k0..kN
+    # so the outer query can restore the order over just `limit` rows
+    directions = ["DESC" if desc else "ASC" for _, desc in keys]
+    order_sql = ", ".join(
+        f"{_sort_col(name)} {d}" for (name, _), d in zip(keys, directions)
+    )
+    key_cols = "".join(
+        f", {_sort_col(name)} AS k{i}" for i, (name, _) in enumerate(keys)
+    )
+    page_order = ", ".join(f"page.k{i} {d}" for i, d in enumerate(directions))
+
+    # Deferred join: filter, sort and page on the narrow key columns first,
+    # then fetch the wide turn columns for the selected turn_idx values only.
+    sql = f"""
+      SELECT t.turn_idx,
+             t.total_char_count,
+             t.invocation_reason,
+             t.turns_to_purge
+        FROM (
+              SELECT t.turn_idx AS turn_idx{key_cols}
+                FROM turns t
+                JOIN tool_meta tm
+                  ON tm.repo_url    = t.repo_url
+                 AND tm.agent_role  = t.agent_role
+                 AND tm.agent_id    = t.agent_id
+                 AND tm.turn_idx    = t.turn_idx
+               WHERE {where_sql}
+            ORDER BY {order_sql}
+               LIMIT ?
+              OFFSET ?
+             ) AS page
+        JOIN turns t
+          ON t.repo_url   = ?
+         AND t.agent_role = ?
+         AND t.agent_id   = ?
+         AND t.turn_idx   = page.turn_idx
+    ORDER BY {page_order}
+    """
+    return sql, seek_names
+
+
+def turns_cursor(turn: UnifiedTurn, sort: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Build the query_turns `after` cursor for the page ending at `turn`,
+    using the same sort spec as the query.
+    """
+    cursor = {}
+    for name, _ in _sort_keys(sort):
+        if name == "turn_idx":
+            cursor[name] = turn.turn_meta["turn"]
+        elif name == "total_char_count":
+            cursor[name] = turn.turn_meta.get("total_char_count", 0)
+        else:
+            cursor[name] = turn.tool_meta.get(name)
+    return cursor
+
+
 def query_turns(
     repo_url: str,
     agent_role: str,
@@ -138,80 +350,49 @@ def query_turns(
     tool_name: Optional[str] = None,
     deleted: Optional[bool] = None,
     sort: Optional[List[str]] = None,
+    after: Optional[Dict[str, Any]] = None,
 ) -> List[UnifiedTurn]:
     """
     Load a page of turns with optional filters and sort.
     Joins turns → tool_meta, applies WHERE clauses, ORDER BY, LIMIT/OFFSET.
+    Pass `after` (see turns_cursor) to seek past the previous page's last
+    turn instead of skipping `offset` rows; NULL sort values page correctly.
     Scoped by (repo_url,agent_role,agent_id).
     """
-    clauses = [
-        "t.repo_url = ?",
-        "t.agent_role = ?",
-        "t.agent_id = ?",
-    ]
-    params = [repo_url, agent_role, agent_id]
+    keys = _sort_keys(sort)
+    sql, seek_names = _compile_query_sql(
+        status is not None,
+        tool_name is not None,
+        deleted is not None,
+        None if after is None else _cursor_nulls(keys, after),
+        keys,
+    )
 
+    params = [repo_url, agent_role, agent_id]
     if status is not None:
-        clauses.append("tm.status = ?")
         params.append(status)
     if tool_name is not None:
-        clauses.append("tm.tool_name = ?")
         params.append(tool_name)
     if deleted is not None:
-        clauses.append("tm.deleted = ?")
         params.append(int(deleted))
+    params.extend(after[name] for name in seek_names)
+    params.extend([limit, offset, repo_url, agent_role, agent_id])
 
-    where_sql = " AND ".join(clauses)
-
-    # Build ORDER BY
-    order_sql = "t.turn_idx ASC"
-    if sort:
-        parts = []
-        for field in sort:
-            desc = field.startswith("-")
-            name = field[1:] if desc else field
-            if name in ("turn_idx", "total_char_count"):
-                col = f"t.{name}"
-            else:
-                col = f"tm.{name}"
-            direction = "DESC" if desc else "ASC"
-            parts.append(f"{col} {direction}")
-        if parts:
-            order_sql = ", ".join(parts)
-
-    sql = f"""
-      SELECT t.turn_idx,
-             t.total_char_count,
-             t.invocation_reason,
-             t.turns_to_purge
-        FROM turns t
-        JOIN tool_meta tm
-          ON tm.repo_url    = t.repo_url
-         AND tm.agent_role  = t.agent_role
-         AND tm.agent_id    = t.agent_id
-         AND tm.turn_idx    = t.turn_idx
-       WHERE {where_sql}
-    ORDER BY {order_sql}
-       LIMIT ?
-      OFFSET ?
-    """
-    params.extend([limit, offset])
-
-    with get_db() as db:
+    with get_reader() as db:
         rows = db.execute(sql, params).fetchall()
 
+    page_idx = [r["turn_idx"] for r in rows]
+    tm_map   = load_tool_meta_bulk(repo_url, agent_role, agent_id, page_idx)
+    msg_map  = load_messages_bulk(repo_url, agent_role, agent_id, page_idx)
+
     result: List[UnifiedTurn] = []
     for r in rows:
         idx               = r["turn_idx"]
         total             = r["total_char_count"]
         invocation_reason = r["invocation_reason"]
         # decode JSON
-        ttp_list = []
-        if r["turns_to_purge"]:
-            try:
-                ttp_list = json.loads(r["turns_to_purge"])
-            except json.JSONDecodeError:
-                ttp_list = []
+        ttp = r["turns_to_purge"]
+        ttp_list = list(_decode_turns_to_purge(ttp)) if ttp else []
 
         turn_meta = {
             "turn":              idx,
@@ -220,8 +401,8 @@ def query_turns(
             "invocation_reason": invocation_reason,
             "turns_to_purge":    ttp_list,
         }
-        tm   = load_tool_meta(repo_url, agent_role, agent_id, idx)
-        msgs = load_messages(repo_url, agent_role, agent_id, idx)
+        tm   = tm_map.get(idx, {})
+        msgs = msg_map.get(idx, {})
         result.append(UnifiedTurn(turn_meta, tm, msgs))
 
     return result
@@ -237,10 +418,9 @@ def delete_turns(
     Cascades into tool_meta & messages.
     """
     with get_db() as db:
-        db.execute(
-            "DELETE FROM turns WHERE repo_url=? AND agent_role=? AND agent_id=?",
-            (repo_url, agent_role, agent_id)
-        )
+        # cascades into tool_meta
+        invalidate_tool_meta_cache(repo_url, agent_role, agent_id)
+        db.execute(_DELETE_TURNS, (repo_url, agent_role, agent_id))
 
 
 # ------------------------------------------------------------------------
@@ -255,18 +435,12 @@ def save_conversation_metadata(
 ) -> None:
     """
     Upsert the entire conversation‐level metadata dict as JSON.
+    An unchanged blob leaves the row (and its pages) untouched.
     """
-    blob = json.dumps(metadata)
+    blob = _dumps(metadata)
     with get_db() as db:
         db.execute(
-            """
-            INSERT INTO conversation_metadata
-              (repo_url, agent_role, agent_id, metadata)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(repo_url, agent_role, agent_id)
-            DO UPDATE SET metadata = excluded.metadata
-            """,
-            (repo_url, agent_role, agent_id, blob),
+            _UPSERT_CONVERSATION_METADATA, (repo_url, agent_role, agent_id, blob)
         )
 
 
@@ -278,19 +452,14 @@ def load_conversation_metadata(
     """
     Load the conversation metadata JSON (or return {} if not present or invalid).
     """
-    with get_db() as db:
+    with get_reader() as db:
         row = db.execute(
-            """
-            SELECT metadata
-              FROM conversation_metadata
-             WHERE repo_url=? AND agent_role=? AND agent_id=?
-            """,
-            (repo_url, agent_role, agent_id),
+            _SELECT_CONVERSATION_METADATA, (repo_url, agent_role, agent_id)
         ).fetchone()
 
     if not row or not row["metadata"]:
         return {}
     try:
-        return json.loads(row["metadata"])
+        return _loads(row["metadata"])
     except json.JSONDecodeError:
         return {}
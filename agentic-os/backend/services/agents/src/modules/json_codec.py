@@ -0,0 +1,33 @@
+# modules/json_codec.py
+
+"""
+JSON encode/decode for the agents service's DB columns and registry
+responses. Uses orjson (listed in requirements.txt) and falls back to the
+stdlib json module where it isn't installed, e.g. a bare dev checkout.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode(obj) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes; non-str keys are stringified."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode()
+
+
+def dumps(obj) -> str:
+    """Serialize obj to JSON text for a TEXT column."""
+    return encode(obj).decode()
+
+
+def loads(text):
+    """Parse JSON text (str or bytes)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
@@ -2,7 +2,7 @@
 
 from typing        import List, Union, Dict
 from modules.agents_running import list_running_agents
-from modules.messages_list   import append_messages
+from modules.messages_list   import append_messages_bulk
 
 def broadcast_message_to_agents(
     agent_roles: List[str],
@@ -28,27 +28,23 @@ def broadcast_message_to_agents(
     roles_set     = set(agent_roles)
     # now scoped by repo_url
     running_agents = list_running_agents(repo_url=repo_url)
+    # if roles_set is non‐empty, filter by roles; else allow all
+    targets = (
+        [a for a in running_agents if a["agent_role"] in roles_set]
+        if roles_set else running_agents
+    )
 
-    success_count = 0
-    error_list: List[str] = []
-
-    for agent in running_agents:
-        ar  = agent["agent_role"]
-        aid = agent["agent_id"]
-        # if roles_set is non‐empty, filter by roles; else allow all
-        if roles_set and ar not in roles_set:
-            continue
-        try:
-            append_messages(
-                agent_role=ar,
-                agent_id=aid,
-                role="user",
-                messages=messages,
-                repo_url=repo_url
-            )
-            success_count += 1
-        except Exception as ex:
-            error_list.append(f"{ar}:{aid} - Exception: {ex}")
+    # one transaction for the whole broadcast rather than one per agent
+    results, errors = append_messages_bulk(
+        [(a["agent_role"], a["agent_id"]) for a in targets],
+        repo_url=repo_url,
+        role="user",
+        messages=messages,
+    )
+    success_count = len(results)
+    error_list: List[str] = [
+        f"{ar}:{aid} - Exception: {ex}" for (ar, aid), ex in errors.items()
+    ]
 
     return {"success_count": success_count, "errors": error_list}
 
@@ -2,7 +2,8 @@
 
 """
 A read‐only view of your existing turns/messages tables,
-plus a helper to append one turn containing multiple messages.
+plus helpers to append one turn containing multiple messages (to one agent,
+or to many agents in a single transaction).
 
 append_messages() does NOT invoke any LLM or tool execution—it only persists
 a new turn with one or more messages into your history.
@@ -10,12 +11,14 @@ a new turn with one or more messages into your history.
 Now scoped to (agent_role, agent_id, repo_url).
 """
 
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 
+from modules.db import get_db
 from modules.turns_list import (
     get_turns_list,
     add_turn_to_list,
     save_turns_list,
+    discard_turns_list,
 )
 from modules.unified_turn import UnifiedTurn
 from modules.db_state import allocate_next_message_id
@@ -132,3 +135,51 @@ def append_messages(
         "turn_id":     ut.turn_meta["turn"],
         "message_ids": msg_ids
     }
+
+
+def append_messages_bulk(
+    targets:    List[Tuple[str, str]],
+    repo_url:   str,
+    role:       str,
+    messages:   Union[str, List[str]],
+    **extra_fields: Any
+) -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], Dict[Tuple[str, str], Exception]]:
+    """
+    append_messages() for each (agent_role, agent_id) in targets, all inside
+    one transaction instead of one per agent. Each agent's append runs under
+    its own savepoint, so a failure is rolled back for that agent only (and
+    its cached history dropped) while the others still commit.
+
+    Returns:
+        (results, errors): append_messages() results and raised exceptions,
+        both keyed by (agent_role, agent_id).
+    """
+    results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    errors:  Dict[Tuple[str, str], Exception]      = {}
+    try:
+        with get_db() as db:
+            for agent_role, agent_id in targets:
+                db.execute("SAVEPOINT append_messages")
+                try:
+                    results[(agent_role, agent_id)] = append_messages(
+                        agent_role=agent_role,
+                        agent_id=agent_id,
+                        repo_url=repo_url,
+                        role=role,
+                        messages=messages,
+                        **extra_fields
+                    )
+                except Exception as ex:
+                    db.execute("ROLLBACK TO append_messages")
+                    discard_turns_list(agent_role, agent_id, repo_url)
+                    errors[(agent_role, agent_id)] = ex
+                finally:
+                    db.execute("RELEASE append_messages")
+    except Exception:
+        # the whole transaction was rolled back; in-memory histories that
+        # already took the new turn no longer match SQLite
+        for agent_role, agent_id in targets:
+            discard_turns_list(agent_role, agent_id, repo_url)
+        raise
+
+    return results, errors
@@ -14,12 +14,40 @@ This function must only be called on an empty history; it will throw
 if history already contains any turns.
 """
 
-from typing import List, Any, Optional
+import functools
+from typing import List, Any, Optional, Tuple
 from shared.config import config
 from shared.logger import logger
 from modules.agents_temp_registry import get_agent_role
 from modules.unified_turn import UnifiedTurn
 
+_DEFAULT_SYSTEM_PROMPT = "Always respond with a valid json object."
+
+
+@functools.lru_cache(maxsize=1)
+def _system_prompt() -> str:
+    """
+    The configured LLM_SYSTEM_PROMPT if it mentions “json”, else the default.
+    Resolved once: an unset key would otherwise cost a config-service round
+    trip per scope on every turn-0. Call _system_prompt.cache_clear() after
+    changing LLM_SYSTEM_PROMPT at runtime.
+    """
+    sys_cfg = config.get("LLM_SYSTEM_PROMPT", "")
+    if sys_cfg and "json" in sys_cfg.lower():
+        return sys_cfg
+    return _DEFAULT_SYSTEM_PROMPT
+
+
+def _resolve_prompts(agent_role: str) -> Tuple[str, str]:
+    """
+    Return (system_content, developer_content) for agent_role.
+    The developer prompt is not memoised here: registry entries are edited
+    remotely and get_agent_role already caches them for a short TTL.
+    """
+    entry = get_agent_role(agent_role)
+    developer_content = entry.default_developer_prompt if entry is not None else ""
+    return _system_prompt(), developer_content
+
 
 def initialize_initial_turn_history(
     history:      List[Any],
@@ -60,17 +88,8 @@ def initialize_initial_turn_history(
             "initialize_initial_turn_history: no agent_role provided or in context"
         )
 
-    # 2) system prompt (must contain “json”)
-    sys_cfg = config.get("LLM_SYSTEM_PROMPT", "")
-    default_system = "Always respond with a valid json object."
-    if sys_cfg and "json" in sys_cfg.lower():
-        system_content = sys_cfg
-    else:
-        system_content = default_system
-
-    # 3) developer prompt (from registry)
-    entry = get_agent_role(agent_role) or {}
-    developer_content = entry.get("default_developer_prompt", "")
+    # 2) system prompt (must contain “json”) + 3) developer prompt (registry)
+    system_content, developer_content = _resolve_prompts(agent_role)
 
     # 4) assemble turn-0 metadata + messages
     turn_meta = {
@@ -1,7 +1,9 @@
 # modules/run_agent_task.py
 
+import functools
 import hashlib
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, Dict, Any, Tuple
 
 from shared.logger import logger
@@ -18,13 +20,57 @@ from modules.agent_call_graph import record_spawn
 from modules.turns_list import update_turns_metadata
 
 # ----------------------------------------------------------------------------
-# Thread‐pool for all run_agent_task calls
+# Thread‐pool for run_agent_task_async calls
 # ----------------------------------------------------------------------------
-_MAX_AGENT_TASK_THREADS = int(config.get("MAX_AGENT_TASK_THREADS", "5"))
-_AGENT_TASK_EXECUTOR   = ThreadPoolExecutor(
-    max_workers=_MAX_AGENT_TASK_THREADS,
-    thread_name_prefix="run-agent-task-worker"
-)
+# Created on first submit, so importing this module (tests, CLI tools)
+# neither starts worker threads nor reads MAX_AGENT_TASK_THREADS.
+_AGENT_TASK_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _AGENT_TASK_EXECUTOR
+    if _AGENT_TASK_EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _AGENT_TASK_EXECUTOR is None:
+                _AGENT_TASK_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=int(config.get("MAX_AGENT_TASK_THREADS", "5")),
+                    thread_name_prefix="run-agent-task-worker"
+                )
+    return _AGENT_TASK_EXECUTOR
+
+
+# ----------------------------------------------------------------------------
+# Cap on concurrent top-level run_agent_task calls
+# ----------------------------------------------------------------------------
+# run_agent_task runs on the caller's thread, so MAX_AGENT_TASK_THREADS is
+# enforced with a semaphore instead of the pool. Only runs without a parent
+# agent take a slot: a nested run waiting on one would deadlock once every
+# slot is held by a parent waiting on its child. Also created on first use.
+_TOP_LEVEL_SLOTS: Optional[threading.BoundedSemaphore] = None
+
+
+def _get_top_level_slots() -> threading.BoundedSemaphore:
+    global _TOP_LEVEL_SLOTS
+    if _TOP_LEVEL_SLOTS is None:
+        with _EXECUTOR_LOCK:
+            if _TOP_LEVEL_SLOTS is None:
+                _TOP_LEVEL_SLOTS = threading.BoundedSemaphore(
+                    int(config.get("MAX_AGENT_TASK_THREADS", "5"))
+                )
+    return _TOP_LEVEL_SLOTS
+
+
+@functools.lru_cache(maxsize=2048)
+def _derive_id_from_prompt(prompt: str) -> str:
+    """
+    Stable 32-hex-char agent_id for a prompt: its MD5. Existing turns,
+    state and agents_running rows are keyed by these ids, so the hash must
+    not change. Not a security use, hence usedforsecurity=False (which also
+    keeps it working on FIPS-mode OpenSSL builds).
+    Pure, so memoised: re-seeding with the same prompt skips encode + hash.
+    """
+    return hashlib.md5(prompt.encode("utf-8"), usedforsecurity=False).hexdigest()
 
 
 def _worker(
@@ -35,6 +81,7 @@ def _worker(
     repo_owner:   Optional[str],
     repo_name:    Optional[str],
     parent_ctx:   Optional[Tuple[str, str, str]],
+    inline:       bool = False,
 ) -> Dict[str, Any]:
     """
     Worker thread for a single run_agent_task invocation.
@@ -44,14 +91,19 @@ def _worker(
     4) Mark agent state = running.
     5) Call run_to_completion.
     Finally, mark idle and restore or clear parent context.
+
+    inline=True means we run on the caller's own thread, which already
+    holds the parent context and the seeded agent, so steps 1, 2 and the
+    final restore are skipped (the caller pops its own seed).
     """
-    # 1) re‐install parent context
-    if parent_ctx:
-        set_thread_current_agent_tuple(*parent_ctx)
+    if not inline:
+        # 1) re‐install parent context
+        if parent_ctx:
+            set_thread_current_agent_tuple(*parent_ctx)
 
-    # 2) re‐seed our agent in this thread (ensures the FK row is visible,
-    #    and also installs (role,id,repo) in thread‐local)
-    seed_agent(agent_role=agent_role, repo_url=repo_url, agent_id=agent_id)
+        # 2) re‐seed our agent in this thread (ensures the FK row is visible,
+        #    and also installs (role,id,repo) in thread‐local)
+        seed_agent(agent_role=agent_role, repo_url=repo_url, agent_id=agent_id)
 
     # 3) record the spawn for the call‐graph (skip self‐loops)
     pkey = (parent_ctx[0], parent_ctx[1]) if parent_ctx else ("<none>", "<none>")
@@ -98,28 +150,23 @@ def _worker(
         # 6) mark idle
         update_turns_metadata(agent_role, agent_id, repo_url, "state", "idle")
         # 7) restore or clear parent context
-        if parent_ctx:
-            set_thread_current_agent_tuple(*parent_ctx)
-        else:
-            set_thread_current_agent_tuple(None, None, None)
+        if not inline:
+            if parent_ctx:
+                set_thread_current_agent_tuple(*parent_ctx)
+            else:
+                set_thread_current_agent_tuple(None, None, None)
 
 
-def run_agent_task(
+def _prepare(
     agent_role:  str,
     repo_url:    str,
     user_prompt: str,
-    agent_id:    Optional[str] = None,
-    repo_owner:  Optional[str] = None,
-    repo_name:   Optional[str] = None,
-) -> Dict[str, Any]:
+    agent_id:    Optional[str],
+) -> Tuple[str, str, Optional[Tuple[str, str, str]]]:
     """
-    Public entrypoint: schedule the agent workflow in a background thread.
-
-    • user_prompt: required, non‐empty.
-    • If agent_id is omitted or blank, compute as MD5(user_prompt).
-    • Capture the current thread‐local context (parent) before seeding.
-    • Seed the agent here (DB insert + thread‐local).
-    • Dispatch a worker thread that re‐seeds and runs to completion.
+    Validate the prompt, derive agent_id if missing, capture the caller's
+    context and seed the agent (DB insert + thread‐local set).
+    Returns (prompt, agent_id, parent_ctx); the caller must pop the seed.
     """
     # 1) enforce non‐empty prompt
     if not user_prompt or not user_prompt.strip():
@@ -128,17 +175,34 @@ def run_agent_task(
 
     # 2) derive agent_id if missing
     if not agent_id or not agent_id.strip():
-        agent_id = hashlib.md5(prompt.encode("utf-8")).hexdigest()
+        agent_id = _derive_id_from_prompt(prompt)
 
     # 3) capture caller’s context
     parent_ctx = get_current_agent_tuple()
 
     # 4) seed the agent now (DB insert + thread‐local set)
     local_agent_id = seed_agent(agent_role=agent_role, repo_url=repo_url, agent_id=agent_id)
+    return prompt, local_agent_id, parent_ctx
+
 
-    # 5) dispatch worker
+def run_agent_task_async(
+    agent_role:  str,
+    repo_url:    str,
+    user_prompt: str,
+    agent_id:    Optional[str] = None,
+    repo_owner:  Optional[str] = None,
+    repo_name:   Optional[str] = None,
+) -> Future:
+    """
+    Like run_agent_task, but return the worker's Future instead of waiting,
+    for callers that fan out several agents or want .result(timeout=...).
+    The Future resolves to the same result dict run_agent_task returns.
+    """
+    prompt, local_agent_id, parent_ctx = _prepare(
+        agent_role, repo_url, user_prompt, agent_id
+    )
     try:
-        future = _AGENT_TASK_EXECUTOR.submit(
+        return _get_executor().submit(
             _worker,
             agent_role,
             repo_url,
@@ -148,7 +212,51 @@ def run_agent_task(
             repo_name,
             parent_ctx,
         )
-        return future.result()
+    finally:
+        # the worker re-seeds in its own thread; restore the caller's context
+        pop_current_agent()
+
+
+def run_agent_task(
+    agent_role:  str,
+    repo_url:    str,
+    user_prompt: str,
+    agent_id:    Optional[str] = None,
+    repo_owner:  Optional[str] = None,
+    repo_name:   Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Public entrypoint: run the agent workflow to completion and return its result.
+
+    • user_prompt: required, non‐empty.
+    • If agent_id is omitted or blank, compute it as MD5(user_prompt).
+    • Capture the current thread‐local context (parent) before seeding.
+    • Seed the agent here (DB insert + thread‐local).
+    • Run the worker right here: the caller blocks on the result either way,
+      so handing it to the pool would only add a thread hop, and from inside
+      a pool worker it could deadlock once every worker waits on a child.
+      Use run_agent_task_async to run agents concurrently.
+    • Top-level runs (no parent agent) wait for one of MAX_AGENT_TASK_THREADS
+      slots; nested runs execute within their parent's slot.
+    """
+    prompt, local_agent_id, parent_ctx = _prepare(
+        agent_role, repo_url, user_prompt, agent_id
+    )
+
+    slots = _get_top_level_slots() if parent_ctx is None else None
+    if slots is not None:
+        slots.acquire()
+    try:
+        return _worker(
+            agent_role,
+            repo_url,
+            prompt,
+            local_agent_id,
+            repo_owner,
+            repo_name,
+            parent_ctx,
+            inline=True,
+        )
     except Exception as e:
         logger.error("run_agent_task uncaught exception", exc_info=True)
         return {
@@ -157,5 +265,7 @@ def run_agent_task(
             "task_result": str(e),
         }
     finally:
+        if slots is not None:
+            slots.release()
         # restore the caller’s context by popping this seed
         pop_current_agent()
@@ -22,7 +22,7 @@ from modules.turns_list import (
     add_turn_to_list,
     clear_turns_for_agent,
 )
-from modules.turns_single_run import run_single_turn
+from modules.turns_single_run import run_single_turn, build_tools_metadata
 from modules.turns_processor import handle_context_violation
 from modules.agents_temp_registry import get_agent_role as _fetch_agent_entry
 
@@ -155,6 +155,10 @@ def _run_to_completion_worker(
         )
     logger.debug("==== end DEBUG ====")
 
+    # the pruned registry is fixed for this run, so the LLM `tools` payload
+    # is built once here instead of on every turn
+    tools_metadata = build_tools_metadata(unified_registry)
+
     # 7) determine max iterations (kept for instrumentation, not used to break)
     raw_max        = config.get("MAX_ITERATIONS", "0")
     max_iterations = int(raw_max) or None
@@ -189,6 +193,7 @@ def _run_to_completion_worker(
             repo_owner=repo_owner,
             repo_name=repo_name,
             reasoning_effort=agent_entry.reasoning_level,
+            tools_metadata=tools_metadata,
         )
 
         # 8c) only stop when we see an accepted set_work_completed call
@@ -9,7 +9,8 @@ from shared.logger import logger
 class ToolRegistryCache:
     """Singleton-like, thread-safe, hot-reloading tool registry cache."""
     def __init__(self, refresh_interval=300):
-        self._lock = threading.RLock()
+        # guards plain field reads/writes only; never held across HTTP calls
+        self._lock = threading.Lock()
         self._registry = None
         self._refresh_interval = refresh_interval
         self._bg_thread = None
@@ -65,9 +66,14 @@ class ToolRegistryCache:
         If not loaded yet, perform an initial refresh.
         """
         with self._lock:
-            if self._registry is None:
-                self.refresh()
-            return self._registry
+            registry = self._registry
+        if registry is None:
+            # fetch outside the lock; concurrent cold callers may both load,
+            # and the last write wins (the registry is idempotent to reload)
+            self.refresh()
+            with self._lock:
+                registry = self._registry
+        return registry
 
 # Singleton instance
 _tool_registry_cache = ToolRegistryCache()
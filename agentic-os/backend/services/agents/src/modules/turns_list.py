@@ -83,6 +83,19 @@ class TurnHistory:
 
         return inst
 
+    @classmethod
+    def discard(cls,
+                agent_role: str,
+                agent_id:   str,
+                repo_url:   str) -> None:
+        """
+        Drop the cached history (if any) without touching SQLite, so the
+        next get() reloads it; for callers whose write was rolled back.
+        """
+        key = (agent_role, agent_id, repo_url)
+        cls._instances.pop(key, None)
+        cls._lru.pop(key, None)
+
     def save(self) -> None:
         """ Persist the in‐memory history and metadata to SQLite. """
         _save_turns(
@@ -193,9 +206,11 @@ class TurnHistory:
         tool_name: Optional[str]       = None,
         deleted:   Optional[bool]      = None,
         sort:      Optional[List[str]] = None,
+        after:     Optional[Dict[str, Any]] = None,
     ) -> List[UnifiedTurn]:
         """
         Raw SQL‐backed, pageable/filterable query (bypasses in‐memory cache).
+        `after` is a turns_cursor() of the previous page's last turn.
         """
         return _query_turns(
             repo_url=self.repo_url,
@@ -203,7 +218,7 @@ class TurnHistory:
             agent_id=self.agent_id,
             limit=limit, offset=offset,
             status=status, tool_name=tool_name,
-            deleted=deleted, sort=sort,
+            deleted=deleted, sort=sort, after=after,
         )
 
     # ------------------------------------------------------------------------
@@ -231,15 +246,25 @@ class TurnHistory:
 # Free‐function wrappers for turns list
 # ------------------------------------------------------------------------
 
+# agents_running imports this module at load time, so its accessor is
+# resolved on first use and then kept here (no per-call import machinery)
+_get_current_agent = None
+
+
+def _current_agent() -> Tuple[str, str, str]:
+    global _get_current_agent
+    if _get_current_agent is None:
+        from modules.agents_running import get_current_agent_tuple as _get_current_agent
+    return _get_current_agent()
+
+
 def get_turns_list(
     agent_role: Optional[str] = None,
     agent_id:   Optional[str] = None,
     repo_url:   Optional[str] = None
 ) -> List[UnifiedTurn]:
     if not (agent_role and agent_id and repo_url):
-        # defer import to avoid circular dependency
-        from modules.agents_running import get_current_agent_tuple as get_current_agent
-        agent_role, agent_id, repo_url = get_current_agent()
+        agent_role, agent_id, repo_url = _current_agent()
     return TurnHistory.get(agent_role, agent_id, repo_url).turns
 
 
@@ -277,6 +302,14 @@ def delete_turns_list(
     TurnHistory.get(agent_role, agent_id, repo_url).delete_all()
 
 
+def discard_turns_list(
+    agent_role: str,
+    agent_id:   str,
+    repo_url:   str
+) -> None:
+    TurnHistory.discard(agent_role, agent_id, repo_url)
+
+
 def query_turns_list(
     agent_role: str,
     agent_id:   str,
@@ -287,11 +320,12 @@ def query_turns_list(
     tool_name:  Optional[str]       = None,
     deleted:    Optional[bool]      = None,
     sort:       Optional[List[str]] = None,
+    after:      Optional[Dict[str, Any]] = None,
 ) -> List[UnifiedTurn]:
     return TurnHistory.get(agent_role, agent_id, repo_url).query(
         limit=limit, offset=offset,
         status=status, tool_name=tool_name,
-        deleted=deleted, sort=sort,
+        deleted=deleted, sort=sort, after=after,
     )
 
 
@@ -308,8 +342,7 @@ def get_turns_metadata(
     Return the metadata dict for this conversation.
     """
     if not (agent_role and agent_id and repo_url):
-        from modules.agents_running import get_current_agent_tuple as get_current_agent
-        agent_role, agent_id, repo_url = get_current_agent()
+        agent_role, agent_id, repo_url = _current_agent()
     return TurnHistory.get(agent_role, agent_id, repo_url).get_metadata()
 
 
@@ -11,7 +11,7 @@ passed through for downstream tool execution.
 """
 
 import time
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from shared.logger import logger
 from shared.config import config
@@ -26,6 +26,29 @@ from modules.turns_processor import handle_assistant_turn
 from modules.ui_tables       import print_all_tables
 
 
+def build_tools_metadata(unified_registry) -> List[Dict[str, Any]]:
+    """
+    Build the OpenAI `tools` list ({"type":"function","function":{…}} entries)
+    from a unified tool registry (dict of tool entries, or a list of them).
+    """
+    if isinstance(unified_registry, dict):
+        registry_values = unified_registry.values()
+    else:
+        registry_values = unified_registry
+
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name":        tool["name"],
+                "description": tool["description"],
+                "parameters":  tool.get("schema", {})  # defaults to {} if missing
+            }
+        }
+        for tool in registry_values
+    ]
+
+
 def run_single_turn(
     agent_role:       str,
     agent_id:         str,
@@ -35,6 +58,7 @@ def run_single_turn(
     repo_owner:       Optional[str] = None,
     repo_name:        Optional[str] = None,
     reasoning_effort: Optional[str] = None,
+    tools_metadata:   Optional[List[Dict[str, Any]]] = None,
 ) -> int:
     """
     Execute one LLM + tool invocation turn:
@@ -47,6 +71,10 @@ def run_single_turn(
       7) Return the next turn index.
 
     All calls are now scoped by (agent_role, agent_id, repo_url).
+
+    tools_metadata may be passed in (see build_tools_metadata) by callers
+    that run many turns against the same registry; otherwise it is built
+    from unified_registry.
     """
 
     # 1) Load history
@@ -63,21 +91,8 @@ def run_single_turn(
     messages = get_outbound_messages(history)
 
     # 3c) Build tools metadata using the updated tools API structure.
-    if isinstance(unified_registry, dict):
-        registry_values = unified_registry.values()
-    else:
-        registry_values = unified_registry
-
-    tools_metadata = []
-    for tool in registry_values:
-        tools_metadata.append({
-            "type": "function",
-            "function": {
-                "name":        tool["name"],
-                "description": tool["description"],
-                "parameters":  tool.get("schema", {})  # defaults to {} if missing
-            }
-        })
+    if tools_metadata is None:
+        tools_metadata = build_tools_metadata(unified_registry)
 
     # 3d) Call the LLM API
     start = time.time()
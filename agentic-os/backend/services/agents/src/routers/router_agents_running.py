@@ -142,7 +142,7 @@ def run_agent_endpoint(
       repo_name?:  string
     }
     Always requires a non-empty user_prompt.  If agent_id is omitted,
-    it will be computed as md5(user_prompt) by seed_agent().
+    it will be computed as md5(user_prompt) by run_agent_task().
     """
     try:
         result = run_agent_task(
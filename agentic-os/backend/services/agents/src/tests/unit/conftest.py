@@ -0,0 +1,43 @@
+# tests/unit/conftest.py
+
+"""
+In-process tests of the agents service's DB layer. They need no running
+services: the whole session works against a throwaway SQLite file.
+"""
+
+import os
+import tempfile
+import uuid
+
+import pytest
+
+# must be set before modules.db is imported (it opens the DB at import)
+_TMP = tempfile.mkdtemp(prefix="agents-unit-")
+os.environ["AGENTS_DB_FILE"] = os.path.join(_TMP, "agents.db")
+os.environ.setdefault("LOG_DIR", _TMP)
+
+REPO_URL = "unit_test_repo"
+
+
+# Override the integration suite's session fixtures (same names), which
+# talk to the Repos and Agents services.
+
+@pytest.fixture(scope="session", autouse=True)
+def ensure_repo_exists_and_services_ready():
+    yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def registry_snapshot_and_cleanup():
+    yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cleanup_cloned_repo():
+    yield
+
+
+@pytest.fixture
+def scope():
+    """A fresh (repo_url, agent_role, agent_id) conversation per test."""
+    return (REPO_URL, "unit", uuid.uuid4().hex[:12])
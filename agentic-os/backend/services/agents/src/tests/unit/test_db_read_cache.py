@@ -0,0 +1,64 @@
+# tests/unit/test_db_read_cache.py
+
+"""
+ReadCache invalidation through get_db() / after_commit(), exercised via the
+agent_state helpers that sit on top of it.
+"""
+
+import pytest
+
+from modules.db import ReadCache, get_db
+from modules.db_state import _state_cache, load_state, save_state
+
+
+def test_write_bumps_generation_and_next_read_sees_it(scope):
+    save_state(*scope, last_turn_idx=1, last_message_id=1)
+    assert load_state(*scope) == (1, 1)
+    assert _state_cache.get(scope) == (1, 1)  # cached
+
+    gen = _state_cache.generation()
+    save_state(*scope, last_turn_idx=2, last_message_id=5)
+
+    assert _state_cache.generation() > gen
+    assert _state_cache.get(scope) is ReadCache.MISS
+    assert load_state(*scope) == (2, 5)
+
+
+def test_invalidation_waits_for_the_outer_block(scope):
+    save_state(*scope, last_turn_idx=1, last_message_id=1)
+    load_state(*scope)
+
+    with get_db():
+        gen = _state_cache.generation()
+        save_state(*scope, last_turn_idx=3, last_message_id=3)
+        # queued until the transaction ends
+        assert _state_cache.generation() == gen
+        # inside the block reads bypass the cache and see the writer's rows
+        assert load_state(*scope) == (3, 3)
+
+    assert _state_cache.generation() > gen
+    assert load_state(*scope) == (3, 3)
+
+
+def test_read_overlapping_a_write_is_not_stored(scope):
+    gen = _state_cache.generation()  # a reader starts...
+    save_state(*scope, last_turn_idx=4, last_message_id=4)  # ...a write lands
+    _state_cache.put(scope, None, (-1, -1), gen)  # ...the reader's stale put
+    assert _state_cache.get(scope) is ReadCache.MISS
+    assert load_state(*scope) == (4, 4)
+
+
+def test_rolled_back_write_does_not_poison_the_cache(scope):
+    save_state(*scope, last_turn_idx=1, last_message_id=1)
+    assert load_state(*scope) == (1, 1)
+
+    with pytest.raises(RuntimeError):
+        with get_db():
+            save_state(*scope, last_turn_idx=9, last_message_id=9)
+            assert load_state(*scope) == (9, 9)  # uncommitted, not cached
+            raise RuntimeError("abort")
+
+    assert _state_cache.get(scope) in (ReadCache.MISS, (1, 1))
+    assert load_state(*scope) == (1, 1)
+    # and the committed value is cacheable again
+    assert _state_cache.get(scope) == (1, 1)
@@ -0,0 +1,75 @@
+# tests/unit/test_db_turns_cursor.py
+
+"""
+Keyset pagination (query_turns `after` / turns_cursor) over sort keys that
+may be NULL.
+"""
+
+import pytest
+
+from modules.db import get_db
+from modules.db_tool_meta import save_tool_meta
+from modules.db_turns import query_turns, turns_cursor
+
+STATUSES   = ["ok", "fail", None]
+TOOL_NAMES = ["read_file", None]
+
+
+def _seed(scope, n=10):
+    repo_url, agent_role, agent_id = scope
+    with get_db() as db:
+        for idx in range(n):
+            db.execute(
+                "INSERT INTO turns (repo_url, agent_role, agent_id, turn_idx, "
+                "total_char_count) VALUES (?,?,?,?,?)",
+                (repo_url, agent_role, agent_id, idx, idx % 4),
+            )
+            save_tool_meta(repo_url, agent_role, agent_id, idx, {
+                "status":    STATUSES[idx % len(STATUSES)],
+                "tool_name": TOOL_NAMES[idx % len(TOOL_NAMES)],
+            })
+
+
+def _query(scope, **kwargs):
+    repo_url, agent_role, agent_id = scope
+    return query_turns(repo_url, agent_role, agent_id, **kwargs)
+
+
+def _page_all(scope, sort, limit=3):
+    seen, after = [], None
+    while True:
+        page = _query(scope, limit=limit, sort=sort, after=after)
+        seen.extend(t.turn_meta["turn"] for t in page)
+        if len(page) < limit:
+            return seen
+        after = turns_cursor(page[-1], sort)
+
+
+@pytest.mark.parametrize("sort", [
+    ["status"],
+    ["-status"],
+    ["status", "-turn_idx"],
+    ["-status", "-turn_idx"],
+    ["tool_name", "-status"],
+    ["-tool_name", "status"],
+    ["-total_char_count", "status"],
+])
+def test_cursor_pages_cover_every_row(scope, sort):
+    _seed(scope)
+    expected = [t.turn_meta["turn"] for t in _query(scope, limit=100, sort=sort)]
+    assert sorted(expected) == list(range(10))
+    assert _page_all(scope, sort) == expected
+
+
+def test_null_sort_values_order_first_ascending_last_descending(scope):
+    _seed(scope)
+    asc  = [t.tool_meta["status"] for t in _query(scope, limit=100, sort=["status"])]
+    desc = [t.tool_meta["status"] for t in _query(scope, limit=100, sort=["-status"])]
+    assert asc == [None] * 3 + ["fail"] * 3 + ["ok"] * 4
+    assert desc == list(reversed(asc))
+
+
+def test_cursor_missing_sort_key_is_rejected(scope):
+    _seed(scope)
+    with pytest.raises(ValueError):
+        _query(scope, limit=3, sort=["status"], after={"turn_idx": 0})
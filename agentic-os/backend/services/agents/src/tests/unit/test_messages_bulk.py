@@ -0,0 +1,98 @@
+# tests/unit/test_messages_bulk.py
+
+"""
+append_messages_bulk: one transaction, one savepoint per agent.
+"""
+
+import uuid
+
+import pytest
+
+import modules.messages_list as messages_list
+from modules.db import get_reader
+from modules.db_state import load_state
+from modules.messages_list import append_messages_bulk, get_messages_list
+from modules.turns_list import get_turns_list
+
+REPO_URL = "unit_test_repo"
+
+
+@pytest.fixture(autouse=True)
+def no_seed_turn(monkeypatch):
+    # a new history is seeded with the role's system prompt, which comes
+    # from the agent-role registry service; start these ones empty
+    import modules.prompts
+    monkeypatch.setattr(
+        modules.prompts, "initialize_initial_turn_history", lambda *args: None
+    )
+
+
+@pytest.fixture
+def targets():
+    run = uuid.uuid4().hex[:12]
+    return [("unit", f"{run}-{n}") for n in range(3)]
+
+
+def _stored_turns(agent_role, agent_id):
+    with get_reader() as db:
+        return db.execute(
+            "SELECT COUNT(*) FROM turns "
+            "WHERE repo_url=? AND agent_role=? AND agent_id=?",
+            (REPO_URL, agent_role, agent_id),
+        ).fetchone()[0]
+
+
+@pytest.fixture
+def fail_for(monkeypatch):
+    """Make the append for one agent raise after its rows were written."""
+    def install(failing):
+        real_save = messages_list.save_turns_list
+
+        def save_turns_list(agent_role, agent_id, repo_url):
+            real_save(agent_role, agent_id, repo_url)
+            if (agent_role, agent_id) == failing:
+                raise RuntimeError("boom")
+
+        monkeypatch.setattr(messages_list, "save_turns_list", save_turns_list)
+    return install
+
+
+def test_failure_rolls_back_only_that_agent(targets, fail_for):
+    failing = targets[1]
+    fail_for(failing)
+
+    results, errors = append_messages_bulk(targets, REPO_URL, "user", "hi")
+
+    assert set(errors) == {failing}
+    assert str(errors[failing]) == "boom"
+    assert set(results) == {targets[0], targets[2]}
+
+    # the failing agent's turn and message id were rolled back...
+    assert _stored_turns(*failing) == 0
+    assert load_state(REPO_URL, *failing) == (-1, -1)
+    # ...and its cached history no longer holds the discarded turn
+    assert get_turns_list(failing[0], failing[1], REPO_URL) == []
+
+
+def test_other_agents_commit(targets, fail_for):
+    fail_for(targets[1])
+
+    append_messages_bulk(targets, REPO_URL, "user", ["a", "b"])
+
+    for agent_role, agent_id in (targets[0], targets[2]):
+        assert _stored_turns(agent_role, agent_id) == 1
+        msgs = get_messages_list(agent_role, agent_id, REPO_URL)
+        assert [(m["message_id"], m["content"]) for m in msgs] == [(0, "a"), (1, "b")]
+
+
+def test_state_cache_invalidated_after_commit(targets):
+    # warm the read cache with the pre-append state
+    for agent_role, agent_id in targets:
+        assert load_state(REPO_URL, agent_role, agent_id) == (-1, -1)
+
+    results, errors = append_messages_bulk(targets, REPO_URL, "user", "hi")
+
+    assert errors == {}
+    for agent_role, agent_id in targets:
+        assert results[(agent_role, agent_id)]["message_ids"] == [0]
+        assert load_state(REPO_URL, agent_role, agent_id)[1] == 0
@@ -30,15 +30,17 @@ class ReposClient:
         api_url: Optional[str]                 = None,
         headers: Optional[Dict[str, str]]      = None,
         timeout: Optional[Union[float, tuple]] = None,
+        session: Optional[requests.Session]    = None,
     ):
         """
         api_url:    override the host (e.g. "http://localhost:8002"). We still append /api/v1.
         headers:    merge/override the default JSON headers.
         timeout:    for non‐blocking calls, either a float (seconds) or a (connect, read) tuple.
+        session:    share an existing requests.Session (and its connection pool).
         """
         base = api_url.rstrip("/") if api_url else SERVICE_URL_REPOS
         self.base_url = f"{base}{API_PREFIX}"
-        self.session  = requests.Session()
+        self.session  = session if session is not None else requests.Session()
         self.headers  = {**DEFAULT_HEADERS, **(headers or {})}
         self.timeout  = timeout if timeout is not None else DEFAULT_TIMEOUT
 
@@ -2,18 +2,40 @@
 # solvin/main.py (entrypoint for `solvin`)
 
 import sys
+import importlib
 import typer
 
 from modules.cli_errorhandler import bannering_handle_exception
 from modules.cli_core      import BannerGroup, global_callback
-import modules.cli_agents   # these imports will go through your excepthook
-import modules.cli_tools
-import modules.cli_repos
-import modules.cli_configs
 
 # install our excepthook so *any* uncaught exception* prints banner + traceback
 sys.excepthook = bannering_handle_exception
 
+# sub-app name → (module, help). Modules are imported on demand below so a
+# single subcommand doesn't pay for every other sub-app's imports.
+SUBAPPS = {
+    "agents":  ("modules.cli_agents",  "Manage running agents"),
+    "tools":   ("modules.cli_tools",   "Manage tools"),
+    "repos":   ("modules.cli_repos",   "Manage repos"),
+    "configs": ("modules.cli_configs", "Manage configs"),
+}
+
+
+def _requested_subapps(argv):
+    """
+    Return the sub-app names to mount for this invocation: just the one
+    named by the first positional argument, or all of them when there is
+    none (root help) or it isn't one we know (let Click report it).
+    """
+    for arg in argv:
+        if arg.startswith("-"):
+            continue
+        if arg in SUBAPPS:
+            return [arg]
+        break
+    return list(SUBAPPS)
+
+
 app = typer.Typer(
     name="solvin",
     help="Agentic OS CLI – Unified entrypoint for all microservices",
@@ -26,11 +48,10 @@ app = typer.Typer(
 # register global flags (version, debug, no-banner, timeout)
 app.callback(invoke_without_command=True)(global_callback)
 
-# mount sub-apps
-app.add_typer(modules.cli_agents.app,  name="agents",  help="Manage running agents")
-app.add_typer(modules.cli_tools.app,   name="tools",   help="Manage tools")
-app.add_typer(modules.cli_repos.app,   name="repos",   help="Manage repos")
-app.add_typer(modules.cli_configs.app, name="configs", help="Manage configs")
+# mount sub-apps (these imports go through our excepthook)
+for _name in _requested_subapps(sys.argv[1:]):
+    _module, _help = SUBAPPS[_name]
+    app.add_typer(importlib.import_module(_module).app, name=_name, help=_help)
 
 def main():
     app()
@@ -62,6 +62,41 @@ async function normalizeReasoningLevel(model_id, storedLevel) {
   return supports ? storedLevel : "";
 }
 
+/**
+ * Shape a stored agent row for the API: parsed tools (with the
+ * default injected), resolved model_name, normalized reasoning_level.
+ */
+async function formatAgent(row) {
+  const {
+    default_user_prompt,
+    allowed_tools: toolsJson,
+    reasoning_level: storedLevel,
+    ...rest
+  } = row;
+  const tools = ensureDefaultTool(parseTools(toolsJson));
+
+  // look up model_name if model_id is set
+  let model_name = "";
+  if (rest.model_id) {
+    const m = await modelManager.getModelById(rest.model_id);
+    model_name = m?.model_name || "";
+  }
+
+  // normalize reasoning_level
+  const reasoning_level = await normalizeReasoningLevel(
+    rest.model_id,
+    storedLevel
+  );
+
+  return {
+    ...rest,
+    default_user_prompt,
+    allowed_tools: tools,
+    model_name,
+    reasoning_level,
+  };
+}
+
 export default async function handler(req, res) {
   const { method, query, body } = req;
 
@@ -74,36 +109,7 @@ export default async function handler(req, res) {
 
         if (row) {
           // existing agent → parse tools & inject default
-          const {
-            default_user_prompt,
-            allowed_tools: toolsJson,
-            reasoning_level: storedLevel,
-            ...rest
-          } = row;
-          const tools = ensureDefaultTool(parseTools(toolsJson));
-
-          // look up model_name if model_id is set
-          let model_name = "";
-          if (rest.model_id) {
-            const m = await modelManager.getModelById(rest.model_id);
-            model_name = m?.model_name || "";
-          }
-
-          // normalize reasoning_level
-          const reasoning_level = await normalizeReasoningLevel(
-            rest.model_id,
-            storedLevel
-          );
-
-          return res.status(200).json({
-            agent: {
-              ...rest,
-              default_user_prompt,
-              allowed_tools: tools,
-              model_name,
-              reasoning_level,
-            },
-          });
+          return res.status(200).json({ agent: await formatAgent(row) });
         }
 
         // not found → return a blank agent so the UI can render a default-checked <li>
@@ -193,8 +199,11 @@ export default async function handler(req, res) {
         reasoning_level,
         tool_choice,
       });
+      // echo the stored entry back so clients don't need a follow-up GET
+      const row = await agentManager.getAgentByType(agent_role);
       return res.status(200).json({
         message: "Agent role created/updated successfully.",
+        ...(row ? { agent: await formatAgent(row) } : {}),
       });
     } catch (err) {
       console.error("POST /api/agent-roles error:", err);